@@ -0,0 +1,11 @@
+# Bundle main.py and scripts/ as precompiled bytecode into one executable zip file
+# usage: sh bundle.sh [output-file]   (default: module-linker.pyz; Python from $PYTHON, default python2.7)
+PYTHON=${PYTHON:-python2.7}
+OUT=${1:-module-linker.pyz}
+TMP=$(mktemp -d) || exit 1
+trap 'rm -rf "$TMP"' EXIT
+mkdir "$TMP/scripts" && cp scripts/*.py "$TMP/scripts/" && cp main.py "$TMP/__main__.py" || exit 1
+"$PYTHON" -m compileall -q "$TMP" > /dev/null || exit 1
+find "$TMP" -name "*.py" -exec rm {} \;
+(cd "$TMP" && "$PYTHON" -m zipfile -c bundle.zip __main__.pyc scripts) || exit 1
+{ echo "#! /usr/bin/env $PYTHON"; cat "$TMP/bundle.zip"; } > "$OUT" && chmod +x "$OUT"
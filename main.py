@@ -4,51 +4,95 @@ import sys
 import os
 import re
 import collections
-import platform
 from scripts import utilities
-try:
-    import argparse
-    from scripts.linker import *
-except:
-    utilities.check_version()
+utilities.check_version()
+from scripts.linker import LinkError, Modules, LinkerWarnings, formatSymbolTable, generateSymbolTable
+from scripts.parsing import parseTokens, resolveArchives
+from scripts import memory
+from scripts import streams
+# other modules are imported only by the features using them, for a fast startup
+
+# constants
+AUTHKEY_VARIABLE = "MODULE_LINKER_AUTHKEY"  # environment variable holding the shared secret of worker nodes
 
 def detectSystem():
-    if platform.system() == 'Windows':
+    if sys.platform == 'win32':
         print "WARNING: ANSI color may not work on Windows Command Prompt.\n\
 You may see meta-escaping characters instead of color output."
         
 def getArgs():
     """Parse command-line arguments with optional functionalities"""
+    import argparse
     
     parser = argparse.ArgumentParser(
                                      formatter_class=argparse.RawDescriptionHelpFormatter,
                                      description="Link multiple modules into a single module", 
-                                     usage="[python] [./]%(prog)s [-nprv] input_file [output_file]",
+                                     usage="[python] [./]%(prog)s [-nprv] [-l ARCHIVE] input_file [output_file]",
                                      epilog="usage examples: \n\
   %(prog)s input.txt output.txt       (save output without printing)\n\
   %(prog)s -p input.txt output.txt    (print formatted output)\n\
   %(prog)s -pr input.txt output.txt   (print human readable output)\n\
   %(prog)s -v input.txt output.txt    (print verbose debug information)\n\
+  %(prog)s -r --modules 120-140 input.txt  (print Modules 120 to 140 human readable)\n\
+  %(prog)s -r --symbol X --pager input.txt (page modules defining or using X)\n\
   %(prog)s input.txt                  (simply print output without saving)\n\
-  %(prog)s -nv input.txt              (print no output but only debug info)\n"
+  %(prog)s -nv input.txt              (print no output but only debug info)\n\
+  %(prog)s --make-archive lib.ar lib.txt  (bundle modules into an archive)\n\
+  %(prog)s -l lib.ar input.txt        (link with modules needed from lib.ar)\n\
+  %(prog)s --gc-modules input.txt     (drop modules unreachable from its first module)\n\
+  %(prog)s --delta old.txt input.txt delta.txt      (save changes relative to old.txt)\n\
+  %(prog)s --apply-delta delta.txt old.txt new.txt  (rebuild new output from old.txt)\n\
+  %(prog)s --memory-budget 512M --memory-report input.txt  (limit and report memory)\n\
+  %(prog)s input.txt.gz output.txt.bz2  (read and write compressed files)\n\
+  %(prog)s --check-only input.txt     (exit status 0 if input.txt links cleanly)\n\
+  %(prog)s --symbols-only --no-warnings input.txt  (print only the symbol table)\n\
+  %(prog)s --bulk-check big.txt             (check a large input as NumPy arrays)\n\
+  %(prog)s --prelink base.ex base.txt base_out.txt    (link base modules once)\n\
+  %(prog)s --use-export base.ex app.txt app_out.txt   (link only app.txt against them)\n\
+  %(prog)s --relocatable input.txt output.txt       (keep relocation records in output)\n\
+  %(prog)s --rebase 200 output.txt moved.txt        (move relocatable output to base 200)\n\
+  %(prog)s --shards 8 input.txt output.txt           (link in 8 shards over local processes)\n\
+  %(prog)s --shards 8 --transport socket input.txt   (link in 8 shards over sockets)\n\
+  %(prog)s --shards 8 --transport socket --workers node1:6000,node2:6000 --authkey-file key input.txt\n\
+                                      (link in 8 shards on worker nodes running shard.serve())\n"
                                      )
-    parser.add_argument('input_file', help="/path/to/input-file.txt")
-    parser.add_argument('output_file', nargs='?', help="/path/to/output-file.txt; if not given, print to standard output")
+    parser.add_argument('input_file', help="/path/to/input-file.txt; compressed files are decompressed on the fly")
+    parser.add_argument('output_file', nargs='?', help="/path/to/output-file.txt; if not given, print to standard output; compressed if ending in .gz, .bz2, .xz or .zst")
     parser.add_argument('-p','--print', action="store_true", dest="to_print", help="print output file content to standard output")
     parser.add_argument('-r','--human', action="store_true", dest="to_human", help="print human readable output to standard output")
     parser.add_argument('-v','--verbose', action="store_true", dest="to_verbose", help="print verbose information")
     parser.add_argument('-n','--no-output', action="store_true", dest="to_no_output", help="do not print output")
+    parser.add_argument('--modules', dest="module_range", metavar="A-B", help="with -r, show only Modules A to B (or a single Module A)")
+    parser.add_argument('--symbol', dest="symbol", metavar="X", help="with -r, show only modules defining or using variable X")
+    parser.add_argument('--pager', action="store_true", dest="pager", help="with -r, show human readable output in a pager ($PAGER, or less)")
+    parser.add_argument('-l','--library', action="append", dest="libraries", default=[], metavar="ARCHIVE", help="extract modules defining undefined symbols from /path/to/archive-file")
+    parser.add_argument('--gc-modules', action="store_true", dest="gc_modules", help="drop modules unreachable from the root modules before linking")
+    parser.add_argument('--gc-root', action="append", type=int, dest="gc_roots", metavar="N", help="number of a root module for --gc-modules; may be repeated (default: the first module of input_file)")
+    parser.add_argument('--delta', dest="delta", metavar="PREVIOUS", help="output only the changes relative to the previous output in /path/to/previous-output")
+    parser.add_argument('--apply-delta', dest="apply_delta", metavar="DELTA", help="apply /path/to/delta-file to the previous output given as input_file instead of linking")
+    parser.add_argument('--memory-budget', dest="memory_budget", metavar="SIZE", help="fail as soon as a stage uses or is projected to use more than SIZE bytes of memory (K, M or G suffix allowed)")
+    parser.add_argument('--memory-report', action="store_true", dest="memory_report", help="print peak and retained memory of every stage, relative to its start")
+    parser.add_argument('--check-only', action="store_true", dest="check_only", help="only check that input_file links cleanly, without relocating, resolving or output")
+    parser.add_argument('--symbols-only', action="store_true", dest="symbols_only", help="only output the symbol table, without checking errors")
+    parser.add_argument('--no-warnings', action="store_false", dest="warnings", help="skip analysis of linker warnings")
+    parser.add_argument('--bulk-check', action="store_true", dest="bulk_check", help="check values and addresses as NumPy arrays (if installed); pays off only on large inputs")
+    parser.add_argument('--prelink', dest="prelink", metavar="EXPORT", help="also save the symbols of the linked modules to /path/to/export-file for later links")
+    parser.add_argument('--use-export', dest="use_export", metavar="EXPORT", help="link input_file against the prelinked modules of /path/to/export-file")
+    parser.add_argument('--relocatable', action="store_true", dest="relocatable", help="also output relocation records of R words and of E words resolved to linked symbols")
+    parser.add_argument('--rebase', type=int, dest="rebase", metavar="NEW_BASE", help="move the relocatable output given as input_file to base address NEW_BASE instead of linking")
+    parser.add_argument('--shards', type=int, dest="shards", metavar="N", help="validate, relocate and resolve the modules in N shards of contiguous modules on worker processes")
+    parser.add_argument('--transport', choices=["local", "socket"], dest="transport", help="transport of --shards to the workers: a local process pool or socket worker nodes (default: local)")
+    parser.add_argument('--workers', dest="workers", metavar="HOST:PORT,...", help="with --transport socket, addresses of the worker nodes (default: start local workers)")
+    parser.add_argument('--authkey-file', dest="authkey_file", metavar="KEYFILE", help="with --transport socket, read the shared secret of the worker nodes from /path/to/key-file (default: $%s)" % AUTHKEY_VARIABLE)
+    parser.add_argument('--make-archive', dest="make_archive", metavar="ARCHIVE", help="bundle the modules of input_file into /path/to/archive-file instead of linking")
     
     # if no argument is given, print help message
     if len(sys.argv)==1:
         parser.print_help()
         sys.exit(1)
     args = parser.parse_args()
-    
-    input_file, output_file, to_print, to_human, to_verbose, to_no_output = \
-    args.input_file, args.output_file, args.to_print, args.to_human, args.to_verbose, args.to_no_output
 
-    return input_file, output_file, to_print, to_human, to_verbose, to_no_output
+    return args
 
 def checkPaths(input_file, output_file, verbose=False):
     """Check validity of paths of input file and output file """
@@ -131,8 +175,8 @@ def readInput(input_file, verbose=False):
     try:
         if verbose:
             utilities.output.debug("Opening input file \"%s\"..." %input_file)
-        f = open(input_file, "r")
-        text = f.read()
+        f = streams.openInput(input_file)  # decompressed on the fly if compressed
+        text = "".join(iter(f.read, ""))
         f.close()
         
     except:
@@ -145,113 +189,48 @@ def readInput(input_file, verbose=False):
     #print text
     return text
 
-def splitInput(text, verbose=False):
-    if verbose:
-        utilities.output.debug("Reading input file...")
-    s = text.split()
-    return s
-
-def parseList(raw_list, verbose=False):
-    """
-    Parse raw_list into a list of module objects
-    """
-    count = 0
-    modules = []
-    mod = None  # declare a local variable for module objects
-    base = 0    # base address for modules
-    try:
-        if verbose:
-            utilities.output.debug("Parsing module structure of input file...")        
-        while raw_list:
-            ind = count % 3
-            num = count / 3 + 1
-            if ind == 0:
-                mod = Module(num, base)   # instantiate a module object at the first stage
-                mod.def_list = _parseDeflist(raw_list, num)
-            if ind == 1:
-                mod.use_list = _parseUselist(raw_list, num)
-            if ind == 2:
-                mod.code = _parseCode(raw_list, num)
-                modules.append(mod)        # append module into modules list at the last parse stage
-                base = mod.next_address    # next base address
-            count += 1
-    except:
-        # all exception should be owing to syntax errors
-        utilities.output.error("There seems to be syntax errors in the input file. Please check the module structures.")
-        sys.exit(1)
-
-    if verbose:
-        utilities.output.debug("%d modules detected in the input file..." % len(modules))
-    return modules
-
-def _parseDeflist(raw_list, mod_num):
-    """
-    Parse and return a raw sublist for Def list
-    """
-    msg = "Def list in Module %d" % mod_num
-    _checkFirstIndex(raw_list, msg)
-    f_num = int(raw_list[0])
-    num = f_num*2 + 1
-    def_list = raw_list[:num]
-    _delRange(num, raw_list)
-    return def_list
-
-def _parseUselist(raw_list, mod_num):
-    """
-    Parse and return a raw sublist for Use list
-    """
-    msg = "Use list in Module %d" % mod_num
-    _checkFirstIndex(raw_list, msg)
-    f_num = int(raw_list[0])
-    num = f_num + 1
-    use_list = raw_list[:num]
-    _delRange(num, raw_list)
-    return use_list
-    
-def _parseCode(raw_list, mod_num):
-    """
-    Parse and return a raw sublist for Code
-    """
-    msg = "Code in Module %d" % mod_num
-    _checkFirstIndex(raw_list, msg)
-    f_num = int(raw_list[0])
-    num = f_num*2 + 1
-    code = raw_list[:num]
-    _delRange(num, raw_list)
-    return code
-
-def _checkFirstIndex(l, msg):
-    """
-    Check whether the first element in the given list is an integer
-    """
-    first = 1
-    try:
-        first = int(l[0])
-        return True
-    except:
-        utilities.output.error("Invalid starting index for %s. Must be an integer." % msg)
-        sys.exit(1)
-    
-def _delRange(num, raw_list):
-    """
-    Delete the first "num" elements in the raw_list
-    """
-    for i in range(num):
-        del raw_list[0]  # remove saved elements from the beginning of raw_list    
-    return
-
 class Config(object):
-    def __init__(self, input_file, output_file, to_print, to_human, to_verbose, to_no_output):
+    def __init__(self, input_file, output_file, to_print, to_human, to_verbose, to_no_output, libraries=None, make_archive=None, gc_roots=None, delta=None, apply_delta=None, memory_budget=None, memory_report=False, prelink=None, use_export=None, check_only=False, symbols_only=False, warnings=True, shards=None, transport="local", relocatable=False, rebase=None, module_range=None, symbol=None, pager=False, bulk_check=False, workers=None, authkey=None):
         self.input_file = input_file
         self.output_file = output_file
         self.to_print = to_print
         self.human = to_human
         self.verbose = to_verbose
         self.no_output = to_no_output
+        self.libraries = libraries or []
+        self.make_archive = make_archive
+        self.gc_roots = gc_roots  # list of root module numbers (empty for the first module); None if garbage collection is disabled
+        self.delta = delta
+        self.apply_delta = apply_delta
+        self.memory_budget = memory_budget  # memory budget in bytes
+        self.memory_report = memory_report
+        self.prelink = prelink
+        self.use_export = use_export
+        self.check_only = check_only
+        self.symbols_only = symbols_only
+        self.warnings = warnings
+        self.shards = shards  # number of shards; None to link in this process
+        self.transport = transport
+        self.relocatable = relocatable
+        self.rebase = rebase  # new base address of a relocatable output; None to link
+        self.module_range = module_range  # tuple (first, last) of module numbers shown with -r; None for all
+        self.symbol = symbol
+        self.pager = pager
+        self.bulk_check = bulk_check
+        self.workers = workers  # list of (host, port) of worker nodes; None to start local workers
+        self.authkey = authkey
         
     def __str__(self):
         return "input_file: %s\noutput_file: %s\nto_print: %s\nhuman: %s\nverbose: %s\nno_output: %s\n" % (self.input_file, self.output_file, self.output_file, self.human, self.verbose, self.no_output)
     
+def _plainArgs(argv):
+    """
+    Return a tuple (input_file, output_file or None) if argv is only "input_file [output_file]", else None
+    """
+    if 1 <= len(argv) <= 2 and not [a for a in argv if a.startswith("-")]:
+        return argv[0], (argv[1] if len(argv) == 2 else None)
+    return None
+
 def preprocess():
     """
     Pre-processing of file paths and configurations
@@ -260,10 +239,107 @@ def preprocess():
         * to_print
         * to_human
         * to_verbose 
+        * libraries
+        * make_archive
+        * gc_roots
+        * delta
+        * apply_delta
+        * memory_budget
+        * memory_report
+        * prelink
+        * use_export
+        * check_only
+        * symbols_only
+        * warnings
+        * shards
+        * transport
+        * relocatable
+        * rebase
+        * module_range
+        * symbol
+        * pager
+        * bulk_check
+        * workers
+        * authkey
     """
-    input_file, output_file, to_print, to_human, to_verbose, to_no_output = getArgs()
-    input_file, output_file = checkPaths(input_file, output_file, to_verbose)
-    return Config(input_file, output_file, to_print, to_human, to_verbose, to_no_output)
+    plain = _plainArgs(sys.argv[1:])
+    if plain:
+        # fast path without building the argparse parser
+        input_file, output_file = checkPaths(plain[0], plain[1])
+        return Config(input_file, output_file, False, False, False, False)
+
+    args = getArgs()
+    input_file, output_file = checkPaths(args.input_file, args.output_file, args.to_verbose)
+    libraries = [checkPaths(l, None)[0] for l in args.libraries]
+    make_archive = None
+    if args.make_archive:
+        make_archive = checkPaths(input_file, args.make_archive)[1]
+    gc_roots = None
+    if args.gc_modules:
+        gc_roots = args.gc_roots or []  # the first module of input_file, once numbered
+    delta_file = checkPaths(args.delta, None)[0] if args.delta else None
+    apply_delta = checkPaths(args.apply_delta, None)[0] if args.apply_delta else None
+    memory_budget = None
+    if args.memory_budget:
+        try:
+            memory_budget = memory.parseSize(args.memory_budget)
+        except ValueError as e:
+            utilities.output.error(str(e))
+            sys.exit(1)
+    prelink = checkPaths(input_file, args.prelink)[1] if args.prelink else None
+    for path, name in [(args.make_archive, "--make-archive"), (args.prelink, "--prelink")]:
+        if path and os.path.splitext(path)[1].lower() in streams.EXTENSIONS:
+            # archives and export files are read back raw, seeking to their offsets
+            utilities.output.error("%s cannot write a compressed file \"%s\"." % (name, path))
+            sys.exit(1)
+    use_export = checkPaths(args.use_export, None)[0] if args.use_export else None
+    if args.shards is not None:
+        if args.shards < 1:
+            utilities.output.error("Number of shards must be a positive integer.")
+            sys.exit(1)
+        if args.to_human or args.use_export or args.check_only or args.symbols_only:
+            utilities.output.error("--shards cannot be used with -r, --use-export, --check-only or --symbols-only.")
+            sys.exit(1)
+    if (args.transport or args.workers or args.authkey_file) and args.shards is None:
+        utilities.output.error("--transport, --workers and --authkey-file can only be used with --shards.")
+        sys.exit(1)
+    transport = args.transport or "local"
+    workers = None
+    authkey = None
+    if args.workers or args.authkey_file:
+        if transport != "socket":
+            utilities.output.error("--workers and --authkey-file can only be used with --transport socket.")
+            sys.exit(1)
+        from scripts import shard
+        try:
+            workers = [shard.parseAddress(a) for a in args.workers.split(",")] if args.workers else None
+        except ValueError as e:
+            utilities.output.error(str(e))
+            sys.exit(1)
+        authkey = readInput(checkPaths(args.authkey_file, None)[0]).strip() if args.authkey_file else None
+    if transport == "socket":
+        authkey = authkey or os.environ.get(AUTHKEY_VARIABLE)
+        if workers and not authkey:
+            utilities.output.error("--workers requires the shared secret of the worker nodes in --authkey-file or $%s." % AUTHKEY_VARIABLE)
+            sys.exit(1)
+    module_range = None
+    if args.module_range:
+        m = re.match(r"^(\d+)(?:-(\d+))?$", args.module_range)
+        if not m:
+            utilities.output.error("Invalid module range \"%s\". Must be A-B or A." % args.module_range)
+            sys.exit(1)
+        module_range = (int(m.group(1)), int(m.group(2) or m.group(1)))
+    if (module_range or args.symbol or args.pager) and not args.to_human:
+        utilities.output.error("--modules, --symbol and --pager can only be used with -r.")
+        sys.exit(1)
+    if args.relocatable and args.delta:
+        utilities.output.error("--relocatable cannot be used with --delta.")
+        sys.exit(1)
+    for mode, name in [(args.symbols_only, "--symbols-only"), (args.check_only, "--check-only")]:
+        if mode and (args.to_human or args.make_archive or args.delta or args.relocatable or args.prelink):
+            utilities.output.error("%s cannot be used with -r, --make-archive, --delta, --relocatable or --prelink." % name)
+            sys.exit(1)
+    return Config(input_file, output_file, args.to_print, args.to_human, args.to_verbose, args.to_no_output, libraries, make_archive, gc_roots, delta_file, apply_delta, memory_budget, args.memory_report, prelink, use_export, args.check_only, args.symbols_only, args.warnings, args.shards, transport, args.relocatable, args.rebase, module_range, args.symbol, args.pager, args.bulk_check, workers, authkey)
 
 def postprocess(format_output, warnings, output_file, verbose=False):
     """
@@ -271,13 +347,19 @@ def postprocess(format_output, warnings, output_file, verbose=False):
         * Print output
         * Dump output into specific output file
     """
+    writeOutput(format_output + '\n\n' + warnings, output_file, verbose)
+
+def writeOutput(text, output_file, verbose=False, mode="w"):
+    """
+    Dump text into specific output file ("wb" mode for binary content)
+    """
     f = None
     try:
         if verbose:
             utilities.output.debug("Opening output file \"%s\" to write." %output_file)
 
-        f = open(output_file, "w")
-        f.write(format_output + '\n\n' + warnings)
+        f = streams.openOutput(output_file, mode)  # compressed by the extension of output_file if any
+        f.write(text)
         
     except:
         utilities.output.error("Cannot write output to file \"%s\"." %output_file)
@@ -286,30 +368,172 @@ def postprocess(format_output, warnings, output_file, verbose=False):
     finally:
         f.close()
     
+def showHuman(chunks, pager=False):
+    """
+    Write human readable output chunk by chunk to standard output,
+    or to a pager ($PAGER, or less) if pager is True
+    """
+    proc = None
+    out = sys.stdout
+    if pager:
+        import subprocess
+        proc = subprocess.Popen(os.environ.get("PAGER") or "less", shell=True, stdin=subprocess.PIPE)
+        out = proc.stdin
+    try:
+        for c in chunks:
+            out.write(c)
+        out.write("\n")
+    except IOError:
+        pass  # the pager was quit before the end
+    finally:
+        if proc:
+            try:
+                proc.stdin.close()
+            except IOError:
+                pass
+            proc.wait()
+
 def main():
     """
     Main control of objects and actions
     """
     detectSystem()
     conf = preprocess()
-    t = readInput(conf.input_file, conf.verbose)
-    r_list = splitInput(t, conf.verbose)
-    mods = parseList(r_list, conf.verbose)
-    modules = Modules(mods, conf.verbose)
-    modules.processModules()
+    tracker = memory.MemoryTracker(conf.memory_budget, conf.verbose, conf.memory_budget is not None or conf.memory_report)
+
+    if conf.apply_delta:
+        from scripts import delta
+        if conf.verbose:
+            utilities.output.debug("Applying delta \"%s\" to previous output..." % conf.apply_delta)
+        new_output = delta.applyDelta(readInput(conf.input_file, conf.verbose), readInput(conf.apply_delta, conf.verbose))
+        if conf.output_file:
+            writeOutput(new_output, conf.output_file, conf.verbose)
+        elif not conf.no_output:
+            sys.stdout.write(new_output)
+        return
+
+    if conf.rebase is not None:
+        from scripts import relocation
+        if conf.verbose:
+            utilities.output.debug("Rebasing relocatable output to base address %d..." % conf.rebase)
+        new_output = relocation.rebase(readInput(conf.input_file, conf.verbose), conf.rebase, conf.verbose)
+        if conf.output_file:
+            writeOutput(new_output, conf.output_file, conf.verbose)
+        elif not conf.no_output:
+            sys.stdout.write(new_output)
+        return
+
+    exports = None
+    start, base = 1, 0  # number and base address of the first module
+    if conf.use_export:
+        from scripts import export
+        exports = export.ExportFile(conf.use_export)
+        start, base = exports.module_num + 1, exports.next_address
+        if conf.verbose:
+            utilities.output.debug("Linking against %d symbols of %d prelinked modules in \"%s\"..." % (len(exports), exports.module_num, conf.use_export))
+
+    # tokens are streamed while parsing, so both are accounted as one stage
+    with tracker.stage("tokenizing and parsing"):
+        if conf.verbose:
+            utilities.output.debug("Streaming tokens of input file \"%s\"..." % conf.input_file)
+        tokens = streams.iterFileTokens(conf.input_file)  # decompressed on the fly if compressed
+        # Code is only needed for the use list warnings in symbols-only mode
+        mods = parseTokens(tokens, conf.verbose, start, base, not conf.symbols_only or conf.warnings)
+
+    if conf.make_archive:
+        from scripts import archive
+        if conf.verbose:
+            utilities.output.debug("Bundling %d modules into archive \"%s\"..." % (len(mods), conf.make_archive))
+        writeOutput(archive.createArchive(mods), conf.make_archive, conf.verbose, "wb")  # member offsets count bytes; never compressed
+        return
+
+    if conf.libraries:
+        from scripts import archive
+        with tracker.stage("resolving archives"):
+            mods = resolveArchives(mods, [archive.Archive(l) for l in conf.libraries], conf.verbose)
+    dropped = []
+    if conf.gc_roots is not None:
+        from scripts import collector
+        # new modules are numbered from start, after the prelinked ones if any
+        mods, dropped = collector.collectModules(mods, conf.gc_roots or [start], conf.verbose, base)
+        if conf.verbose:
+            utilities.output.debug("%d modules dropped as unreachable..." % len(dropped))
+
+    if conf.symbols_only:
+        with tracker.stage("output rendering"):
+            format_output = formatSymbolTable(generateSymbolTable(mods)) + "\n"
+            linker_warnings = LinkerWarnings(mods, [v for m in mods for v in m.getDefVars().keys()],
+                                             list(set([v for m in mods for v in m.getUseVars()])))
+            if conf.warnings:
+                linker_warnings.process()
+            warnings = linker_warnings.output()
+        for w in linker_warnings.messages:
+            utilities.output.warning(w)
+        if not conf.no_output and (conf.to_print or not conf.output_file):
+            print format_output
+            if warnings:
+                print warnings
+        if conf.output_file:
+            postprocess(format_output, warnings, conf.output_file, conf.verbose)
+        if conf.memory_report:
+            print tracker.report()
+        return
+
+    if conf.shards:
+        from scripts import shard
+        if conf.transport == "socket":
+            transport = shard.SocketTransport(conf.workers, authkey=conf.authkey)
+        else:
+            transport = shard.TRANSPORTS[conf.transport]()
+        try:
+            with tracker.stage("sharded link"):
+                modules = shard.link(mods, transport, conf.shards, conf.warnings, conf.verbose)  # linked, as after processModules()
+        finally:
+            transport.close()
+    else:
+        tracker.project("Modules construction", tracker.retained("tokenizing and parsing"))
+        with tracker.stage("Modules construction"):
+            modules = Modules(mods, conf.verbose, exports, conf.warnings, conf.bulk_check)
+    for w in modules.warnings:
+        utilities.output.warning(w)
+
+    if conf.check_only:
+        with tracker.stage("checking relocation"):
+            modules.checkRelocation()
+        if conf.memory_report:
+            print tracker.report()
+        if conf.verbose:
+            utilities.output.debug("Checking is complete. %d modules link cleanly." % len(mods))
+        return
+    if not conf.shards:
+        tracker.project("processModules", tracker.retained("tokenizing and parsing"))
+        with tracker.stage("processModules"):
+            modules.processModules()
 
     # assign to local variables
-    format_output = modules.output()
-    human_output = modules
-    warnings = modules.outputWarnings()
+    format_output = None  # rendered only if saved or printed, not for -r or --delta alone
+    with tracker.stage("output rendering"):
+        if not conf.delta and (conf.output_file or not (conf.no_output or conf.human)):
+            format_output = modules.output()
+        warnings = modules.outputWarnings()
+        if format_output is not None and conf.relocatable:
+            from scripts import relocation
+            format_output += "\n" + relocation.formatRelocations(relocation.relocationRecords(mods, modules.symbol_table))
     number = modules.number  # number of modules processed (linked)
+
+    if conf.delta:
+        from scripts import delta
+        if conf.verbose:
+            utilities.output.debug("Computing delta relative to previous output \"%s\"..." % conf.delta)
+        format_output = delta.makeDelta(readInput(conf.delta, conf.verbose), modules.symbol_table, modules.image(), warnings, modules.start_address)
+        warnings = ""  # warnings are carried in the delta
     
     if not conf.no_output:   
         if conf.to_print or not conf.output_file: # if to_print is enabled or output_file is not given
             if conf.human:
                 if conf.verbose:
                     utilities.output.debug("Print human readable output...")
-                print human_output
+                showHuman(modules.iterHuman(conf.module_range, conf.symbol), conf.pager)
                 if warnings:
                     print warnings
             else:
@@ -318,14 +542,38 @@ def main():
                 print format_output
                 if warnings:
                     print warnings
+        if dropped:
+            print collector.formatDropped(dropped)
 
     if conf.output_file:
-        postprocess(format_output, warnings, conf.output_file, conf.verbose)
+        if conf.delta:
+            writeOutput(format_output, conf.output_file, conf.verbose)
+        else:
+            postprocess(format_output, warnings, conf.output_file, conf.verbose)
     
+    if conf.prelink:
+        from scripts import export
+        if conf.verbose:
+            utilities.output.debug("Saving symbols of prelinked modules to \"%s\"..." % conf.prelink)
+        symbols = collections.OrderedDict(exports.items() if exports else [])
+        symbols.update(modules.symbol_table)
+        last = mods[-1] if mods else None
+        writeOutput(export.createExport(symbols,
+                                        sum([m.size for m in mods]) + (exports.total_size if exports else 0),
+                                        last.next_address if last else base,
+                                        last.number if last else start - 1), conf.prelink, conf.verbose, "wb")
+
+    if conf.memory_report:
+        print tracker.report()
+
     if conf.verbose:
         utilities.output.debug("Linking process is complete. %d modules linked." % number)
        
 if __name__ == '__main__':
-    main()
+    try:
+        main()
+    except LinkError as e:
+        utilities.output.error(str(e))
+        sys.exit(1)
     
     
\ No newline at end of file
@@ -0,0 +1,120 @@
+# -*- coding: utf-8  -*-
+import os
+import utilities
+import archive
+import collector
+import memory
+import export
+import streams
+from linker import Modules, formatOutput
+from parsing import parseTokens, resolveArchives
+
+class LinkResult(object):
+    """
+    LinkResult: structured result of an in-process link
+        * symbol_table: ordered dictionary mapping variables to their values
+        * image: list of addresses in memory order
+        * warnings: list of warning messages
+        * diagnostics: list of tuples (kind, variable, module_number) for every warning
+        * dropped: list of numbers of modules dropped as unreachable
+    """
+    def __init__(self, modules, dropped=None):
+        """
+        Initializing with a processed Modules object
+
+        @param modules: a Modules object after processModules()
+        @param dropped: a list of Module objects dropped as unreachable
+        """
+        self.__modules = modules
+        self.__symbol_table = modules.symbol_table
+        self.__image = modules.image()
+        self.__warnings = list(modules.warnings)
+        lw = modules.linker_warnings
+        self.__diagnostics = [("defined-unused", t[0], t[1]) for t in lw.def_warnings] + \
+                             [("used-unused", t[0], t[1]) for t in lw.use_warnings]
+        self.__dropped = [mod.number for mod in dropped or []]
+
+    @property
+    def modules(self):
+        return self.__modules
+
+    @property
+    def symbol_table(self):
+        return self.__symbol_table
+
+    @property
+    def image(self):
+        return self.__image
+
+    @property
+    def warnings(self):
+        return self.__warnings
+
+    @property
+    def diagnostics(self):
+        return self.__diagnostics
+
+    @property
+    def dropped(self):
+        return self.__dropped
+
+    @property
+    def number(self):
+        return self.__modules.number
+
+    def output(self):
+        """
+        Return formatted output with warnings, as dumped in an output file
+        """
+        return formatOutput(self.symbol_table, self.image, self.__modules.start_address) + "\n\n" + self.__modules.outputWarnings()
+
+def sourceTokens(source):
+    """
+    Return an iterator over the tokens of source, which is a file object, a path or the text itself;
+    compressed files are decompressed on the fly
+    """
+    if hasattr(source, "read"):
+        return streams.iterTokens(streams.openStream(source))
+    if "\n" not in source and os.path.isfile(source):
+        return streams.iterFileTokens(source)
+    return iter(source.split())
+
+def link(source, libraries=None, gc_roots=None, verbose=False, tracker=None, exports=None, check_warnings=True, bulk_check=False):
+    """
+    Link the modules of source and return a LinkResult;
+    raise LinkError on any error, without printing or exiting
+
+    @param source: input text, /path/to/input-file or a file object
+    @param libraries: a list of paths to archive files or Archive objects
+    @param gc_roots: a list of root module numbers to drop unreachable modules; None to keep all
+    @param tracker: a MemoryTracker accounting (and limiting) memory per stage; None for no accounting
+    @param exports: a path to an export file or ExportFile of prelinked modules to link against
+    @param check_warnings: if False, skip analysis of linker warnings
+    @param bulk_check: if True and NumPy is installed, check values and addresses as arrays
+    """
+    if exports is not None and not isinstance(exports, export.ExportFile):
+        exports = export.ExportFile(exports)
+    start, base = (exports.module_num + 1, exports.next_address) if exports is not None else (1, 0)
+    if tracker is None:
+        tracker = memory.MemoryTracker(enabled=False)
+    with tracker.stage("tokenizing and parsing"):  # tokens are streamed while parsing
+        tokens = sourceTokens(source)
+        mods = parseTokens(tokens, verbose, start, base)
+        if libraries:
+            archives = [l if isinstance(l, archive.Archive) else archive.Archive(l) for l in libraries]
+            mods = resolveArchives(mods, archives, verbose)
+    dropped = []
+    if gc_roots:
+        mods, dropped = collector.collectModules(mods, gc_roots, verbose, base)
+    tracker.project("Modules construction", tracker.retained("tokenizing and parsing"))
+    with tracker.stage("Modules construction"):
+        modules = Modules(mods, verbose, exports, check_warnings, bulk_check)
+    tracker.project("processModules", tracker.retained("tokenizing and parsing"))
+    with tracker.stage("processModules"):
+        modules.processModules()
+    with tracker.stage("output rendering"):
+        result = LinkResult(modules, dropped)
+    return result
+
+if __name__ == '__main__':
+    utilities.output.warning("Please run main.py script from project's directory.")
@@ -0,0 +1,179 @@
+# -*- coding: utf-8  -*-
+import collections
+import utilities
+from linker import LinkError
+
+# constants
+ARCHIVE_MAGIC = "!<modlib>"
+
+class Archive(object):
+    """
+    Archive: a library of reusable modules bundled in a single file
+        * An index mapping each defined symbol to the member defining it
+        * Members read from their offsets only when extracted
+
+    Archive file layout:
+        !<modlib>
+        index <number of entries> <number of members>
+        <symbol> <member number> <member offset>
+        ...
+        member <member number> <number of lines>
+        <module text>
+        ...
+
+    Member offsets count bytes from the first line after the index.
+    Archives without offsets are scanned once for their member headers.
+    """
+    def __init__(self, path):
+        """
+        Initializing with the path to an archive file
+
+        @param path: /path/to/archive-file
+        """
+        self.__path = path
+        self.__index = collections.OrderedDict()  # dictionary mapping symbols to member numbers
+        self.__offsets = {}                       # dictionary mapping member numbers to offsets
+        self.__member_num = 0
+        self.__members_start = 0                  # position of the first line after the index
+        self.__scanned = False
+        self._load()
+
+    @property
+    def path(self):
+        return self.__path
+
+    @property
+    def index(self):
+        return self.__index
+
+    @property
+    def member_num(self):
+        return self.__member_num
+
+    def lookup(self, symbol):
+        """
+        Return the number of the member defining symbol, or None
+        """
+        return self.__index.get(symbol)
+
+    def member(self, number):
+        """
+        Return the raw text of the member specified by number
+        """
+        text = self._read(number)
+        if text is None and not self.__scanned:
+            self._scan()  # offsets do not match the file, e.g. line endings were converted
+            text = self._read(number)
+        if text is None:
+            raise LinkError("Index of archive \"%s\" refers to missing member %d." % (self.path, number))
+        return text
+
+    def _open(self):
+        try:
+            return open(self.path, "rb")
+        except IOError:
+            raise LinkError("Cannot open the archive \"%s\"" % self.path)
+
+    def _load(self):
+        """
+        Read the index of the archive file, without reading its members
+            Called in self.__init__()
+        """
+        f = self._open()
+        try:
+            if f.readline().strip() != ARCHIVE_MAGIC:
+                raise ValueError
+            head = f.readline().split()
+            if head[0] != "index":
+                raise ValueError
+            with_offsets = len(head) == 3
+            for i in range(int(head[1])):
+                entry = f.readline().split()
+                if len(entry) != (3 if with_offsets else 2):
+                    raise ValueError
+                number = int(entry[1])
+                self.__index[entry[0]] = number
+                if with_offsets:
+                    self.__offsets[number] = int(entry[2])
+            self.__members_start = f.tell()
+            if with_offsets:
+                self.__member_num = int(head[2])
+        except (IndexError, ValueError):
+            raise LinkError("\"%s\" is not a valid module archive." % self.path)
+        finally:
+            f.close()
+        if not with_offsets:
+            self._scan()
+
+        for symbol, number in self.__index.items():
+            if number >= self.__member_num:
+                raise LinkError("Index entry %s of archive \"%s\" refers to missing member %d." % (symbol, self.path, number))
+
+    def _scan(self):
+        """
+        Find the offsets of all members by skipping from member header to member header
+        """
+        self.__scanned = True
+        self.__offsets = {}
+        f = self._open()
+        try:
+            f.seek(self.__members_start)
+            while True:
+                offset = f.tell() - self.__members_start
+                line = f.readline()
+                if not line:
+                    break
+                head = line.split()
+                if not head:
+                    continue
+                if head[0] != "member" or int(head[1]) != len(self.__offsets):
+                    raise ValueError
+                self.__offsets[int(head[1])] = offset
+                for i in range(int(head[2])):
+                    f.readline()
+        except (IndexError, ValueError):
+            raise LinkError("\"%s\" is not a valid module archive." % self.path)
+        finally:
+            f.close()
+        self.__member_num = len(self.__offsets)
+
+    def _read(self, number):
+        """
+        Return the raw text of the member at its offset, or None if no member starts there
+        """
+        if number not in self.__offsets:
+            return None
+        f = self._open()
+        try:
+            f.seek(self.__members_start + self.__offsets[number])
+            head = f.readline().split()
+            if len(head) != 3 or head[0] != "member" or head[1] != str(number) or not head[2].isdigit():
+                return None
+            return "".join([f.readline() for i in range(int(head[2]))])
+        finally:
+            f.close()
+
+def createArchive(modules):
+    """
+    Return the text of an archive with each module of the list as a member
+
+    @param modules: a list of Module objects
+    """
+    index = []    # list of tuples (symbol, member number, member offset)
+    members = []  # list of member headers and texts
+    offset = 0
+    for number, mod in enumerate(modules):
+        text = "\n".join([" ".join(mod.def_list), " ".join(mod.use_list), " ".join(mod.code)])
+        for var in mod.getDefVars().keys():
+            index.append((var, number, offset))
+        member = "member %d %d\n%s\n" % (number, len(text.splitlines()), text)
+        members.append(member)
+        offset += len(member)
+
+    r = [ARCHIVE_MAGIC, "index %d %d" % (len(index), len(members))]
+    for t in index:
+        r.append("%s %d %d" % t)
+    return "\n".join(r) + "\n" + "".join(members)
+
+if __name__ == '__main__':
+    utilities.output.warning("Please run main.py script from project's directory.")
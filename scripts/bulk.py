@@ -0,0 +1,84 @@
+# -*- coding: utf-8  -*-
+import utilities
+try:
+    import numpy
+except ImportError:
+    numpy = None  # optional; without NumPy all words are checked one by one
+
+"""
+Bulk validation of all def values and code words of a link as integer arrays
+    * Candidates for each rule are found by array comparisons in one step
+    * Messages are built by the per-item checks of linker.py, run only
+      when an array comparison finds a candidate
+"""
+
+# constants
+MAX_DIGITS = 18  # longest digit string converted to a 64-bit integer without overflow
+
+class WordArrays(object):
+    """
+    WordArrays: def values and code words of a list of modules as NumPy arrays
+    """
+    def __init__(self, modules, machine_size):
+        """
+        @param modules: a list of Module objects, each with a body unlike those before it
+        @param machine_size: size of the machine memory
+        """
+        self.__machine_size = machine_size
+        values = []
+        kinds = []
+        words = []
+        value_nums = []  # number of def values in each module
+        for mod in modules:
+            v = mod.getDefVars().values()
+            values += v
+            value_nums.append(len(v))
+            kinds += mod.code[1::2]
+            words += mod.code[2::2]
+        self.__values = numpy.array(values, dtype=str)
+        self.__kinds = numpy.array(kinds, dtype=str)
+        self.__words = numpy.array(words, dtype=str)
+        self.__sizes = numpy.array([mod.size for mod in modules], dtype=int)
+        self.__use_nums = numpy.array([len(mod.use_list) - 1 for mod in modules], dtype=int)
+        positions = numpy.arange(len(modules))
+        self.__value_pos = numpy.repeat(positions, value_nums)            # position of the module of every value
+        self.__word_pos = numpy.repeat(positions, self.__sizes.clip(0))   # position of the module of every word
+
+        # plain digits fitting in a C long are integers for sure; anything else (e.g. a sign,
+        # or too many digits for astype(int)) is left to the per-item check
+        self.__digit_values = (numpy.char.isdigit(self.__values) & (numpy.char.str_len(self.__values) <= MAX_DIGITS)) \
+                              if len(values) else numpy.ones(0, dtype=bool)
+        self.__digit_words = (numpy.char.isdigit(self.__words) & (numpy.char.str_len(self.__words) == 4)) \
+                             if len(words) else numpy.ones(0, dtype=bool)
+
+    def syntaxCandidates(self):
+        """
+        Return a sorted list of positions of the modules with a def value or code word
+        that may break the syntax check
+        """
+        pos = numpy.concatenate([self.__value_pos[~self.__digit_values], self.__word_pos[~self.__digit_words]])
+        return sorted(set(pos.tolist()))
+
+    @property
+    def exact(self):
+        """
+        Whether all values and words are plain digits, i.e. the rule checks on the arrays are exact
+        """
+        return bool(self.__digit_values.all() and self.__digit_words.all())
+
+    def violations(self):
+        """
+        Return the names of the LinkerErrors rules with a candidate violation, in rule order;
+        only valid if exact
+        """
+        values = self.__values.astype(int)
+        words = self.__words.astype(int)
+        fields = words % 1000  # rightmost 3-digit of every address
+        masks = [("_defVarExceed", values >= self.__sizes[self.__value_pos]),
+                 ("_extAddExceed", (self.__kinds == "E") & (fields >= self.__use_nums[self.__word_pos])),
+                 ("_absAddExceed", (self.__kinds == "A") & (fields >= self.__machine_size)),
+                 ("_relAddExceed", (self.__kinds == "R") & (fields >= self.__sizes[self.__word_pos]))]
+        return [rule for rule, mask in masks if mask.any()]
+
+if __name__ == '__main__':
+    utilities.output.warning("Please run main.py script from project's directory.")
@@ -0,0 +1,79 @@
+# -*- coding: utf-8  -*-
+import collections
+import utilities
+from linker import LinkError
+
+def dependencyGraph(modules):
+    """
+    Return an ordered dictionary mapping each module number to the list of
+    numbers of the modules defining the variables in its Use list
+    """
+    definers = collections.defaultdict(list)  # dictionary mapping variables to numbers of modules defining them
+    for mod in modules:
+        for var in mod.getDefVars().keys():
+            definers[var].append(mod.number)
+
+    graph = collections.OrderedDict()
+    for mod in modules:
+        deps = []
+        for var in mod.getUseVars():
+            for number in definers.get(var, []):
+                if number not in deps:
+                    deps.append(number)
+        graph[mod.number] = deps
+    return graph
+
+def reachable(graph, roots):
+    """
+    Return the set of module numbers reachable from roots in graph
+    """
+    seen = set()
+    stack = list(roots)
+    while stack:
+        number = stack.pop()
+        if number in seen:
+            continue
+        seen.add(number)
+        stack += graph[number]
+    return seen
+
+def collectModules(modules, roots, verbose=False, base=0):
+    """
+    Drop the modules unreachable from roots and re-assign base addresses of the kept modules,
+    return a tuple of the lists (kept modules, dropped modules)
+
+    @param modules: a list of Module objects
+    @param roots: a list of numbers of modules always kept
+    @param base: base address of the first kept module
+    """
+    if verbose:
+        utilities.output.debug("Collecting modules unreachable from Module(s) %s..." % ", ".join([str(r) for r in roots]))
+    graph = dependencyGraph(modules)
+    for r in roots:
+        if r not in graph:
+            raise LinkError("Root module %d does not exist." % r)
+
+    live = reachable(graph, roots)
+    kept = []
+    dropped = []
+    for mod in modules:
+        if mod.number in live:
+            mod.base_address = base
+            base = mod.next_address
+            kept.append(mod)
+        else:
+            dropped.append(mod)
+    return kept, dropped
+
+def formatDropped(dropped):
+    """
+    Return formatted report of the dropped modules
+    """
+    r = []
+    for mod in dropped:
+        defs = " ".join(mod.getDefVars().keys())
+        r.append("Module %d (size %d) was dropped as unreachable%s" % (mod.number, mod.size, "; defines " + defs if defs else ""))
+    return "\n".join(r)
+
+if __name__ == '__main__':
+    utilities.output.warning("Please run main.py script from project's directory.")
@@ -0,0 +1,167 @@
+# -*- coding: utf-8  -*-
+import collections
+import utilities
+from linker import formatOutput, LinkError
+
+# constants
+DELTA_MAGIC = "!<delta>"
+
+"""
+Delta file layout:
+    !<delta>
+    symbols <number of entries>       (or "symbols! <n>" to replace the whole table)
+    <variable>=<value>                (changed or added variable)
+    -<variable>                       (removed variable)
+    words <index of first address> <image length> <number of ranges>
+    <start position> <count> <address> ...
+    warnings <number of lines>        (or "warnings same")
+    <warning line>
+    ...
+"""
+
+def parseOutput(text):
+    """
+    Parse a linked output (as dumped in an output file) into a tuple of
+    (symbol table as an ordered dictionary, list of addresses, warnings text, index of the first address)
+    """
+    symbol_table = collections.OrderedDict()
+    addrs = []
+    start = None
+    lines = text.splitlines()
+    pos = 0
+    try:
+        while pos < len(lines) and lines[pos].strip():
+            var, value = lines[pos].split("=", 1)
+            symbol_table[var] = value
+            pos += 1
+        while pos < len(lines) and not lines[pos].strip():
+            pos += 1
+        while pos < len(lines) and lines[pos].strip():
+            ind, addr = lines[pos].split(":", 1)
+            if start is None:
+                start = int(ind)
+            if int(ind) != start + len(addrs):
+                raise ValueError
+            addrs.append(addr.strip())
+            pos += 1
+    except ValueError:
+        raise LinkError("Line %d is not a valid line of linked output." % (pos + 1))
+    warnings = "\n".join([l for l in lines[pos:] if l.strip()])
+    if warnings:
+        warnings += "\n"
+    return symbol_table, addrs, warnings, start or 0
+
+def _changedRanges(old, new):
+    """
+    Return a list of tuples (start index, list of addresses) covering
+    the addresses of new that differ from (or are missing in) old
+    """
+    ranges = []
+    start = None
+    for i, addr in enumerate(new):
+        if i < len(old) and old[i] == addr:
+            if start is not None:
+                ranges.append((start, new[start:i]))
+                start = None
+        elif start is None:
+            start = i
+    if start is not None:
+        ranges.append((start, new[start:]))
+    return ranges
+
+def _applySymbols(symbol_table, entries):
+    """
+    Return a copy of symbol_table with the changed, added and removed entries applied
+    """
+    r = collections.OrderedDict(symbol_table)
+    for e in entries:
+        if e.startswith("-"):
+            del r[e[1:]]
+        else:
+            var, value = e.split("=", 1)
+            r[var] = value
+    return r
+
+def makeDelta(old_text, symbol_table, addrs, warnings, start=0):
+    """
+    Return the delta turning the previous output old_text into the output of
+    the given symbol table, addresses (the first at index start) and warnings
+    """
+    old_table, old_addrs, old_warnings = parseOutput(old_text)[:3]
+
+    entries = []
+    for var, value in symbol_table.items():
+        if old_table.get(var) != value:
+            entries.append("%s=%s" % (var, value))
+    for var in old_table.keys():
+        if var not in symbol_table:
+            entries.append("-%s" % var)
+    if _applySymbols(old_table, entries).items() == symbol_table.items():
+        r = [DELTA_MAGIC, "symbols %d" % len(entries)] + entries
+    else:
+        # order of variables changed; replace the whole table
+        r = [DELTA_MAGIC, "symbols! %d" % len(symbol_table)]
+        r += ["%s=%s" % t for t in symbol_table.items()]
+
+    ranges = _changedRanges(old_addrs, addrs)
+    r.append("words %d %d %d" % (start, len(addrs), len(ranges)))
+    for pos, words in ranges:
+        r.append("%d %d %s" % (pos, len(words), " ".join(words)))
+
+    if warnings.strip() == old_warnings.strip():
+        r.append("warnings same")
+    else:
+        w = warnings.splitlines()
+        r.append("warnings %d" % len(w))
+        r += w
+    return "\n".join(r) + "\n"
+
+def applyDelta(old_text, delta_text):
+    """
+    Return the output obtained by applying delta_text to the previous output old_text
+    """
+    symbol_table, addrs, warnings, start = parseOutput(old_text)
+    lines = delta_text.splitlines()
+    try:
+        if lines[0].strip() != DELTA_MAGIC:
+            raise ValueError
+        head = lines[1].split()
+        num = int(head[1])
+        entries = lines[2:2 + num]
+        if head[0] == "symbols!":
+            symbol_table = _applySymbols(collections.OrderedDict(), entries)
+        elif head[0] == "symbols":
+            symbol_table = _applySymbols(symbol_table, entries)
+        else:
+            raise ValueError
+        pos = 2 + num
+
+        head = lines[pos].split()
+        if head[0] != "words":
+            raise ValueError
+        start, length = int(head[1]), int(head[2])
+        addrs = (addrs + [None] * length)[:length]
+        for i in range(int(head[3])):
+            pos += 1
+            r = lines[pos].split()
+            first, count = int(r[0]), int(r[1])
+            if len(r) != count + 2:
+                raise ValueError
+            addrs[first:first + count] = r[2:]
+        if None in addrs:
+            raise ValueError
+        pos += 1
+
+        head = lines[pos].split()
+        if head[0] != "warnings":
+            raise ValueError
+        if head[1] != "same":
+            w = lines[pos + 1:pos + 1 + int(head[1])]
+            warnings = "\n".join(w) + "\n" if w else ""
+    except (IndexError, KeyError, ValueError):
+        raise LinkError("The delta is not valid for the given previous output.")
+
+    return formatOutput(symbol_table, addrs, start) + "\n\n" + warnings
+
+if __name__ == '__main__':
+    utilities.output.warning("Please run main.py script from project's directory.")
@@ -0,0 +1,124 @@
+# -*- coding: utf-8  -*-
+import struct
+import utilities
+from linker import LinkError
+
+# constants
+EXPORT_MAGIC = "MLEX"
+EXPORT_VERSION = 1
+HEADER = struct.Struct(">4sHIHIII")  # magic, version, record count, name width, total size, next base address, module count
+ADDRESS = struct.Struct(">I")
+
+"""
+Export file layout (big-endian):
+    header:  magic, version, record count, name width,
+             total size, next base address, module count
+    records: fixed-width, sorted by variable name
+             <variable padded with NUL to name width> <absolute address>
+"""
+
+class ExportFile(object):
+    """
+    ExportFile: the symbols of a prelinked set of modules
+        * Absolute addresses of all variables, looked up by binary search
+        * Total size, next base address and number of modules of the set
+    """
+    def __init__(self, path):
+        """
+        Initializing with the path to an export file
+
+        @param path: /path/to/export-file
+        """
+        self.__path = path
+        f = None
+        try:
+            f = open(path, "rb")
+            self.__data = f.read()
+        except IOError:
+            raise LinkError("Cannot open the export file \"%s\"" % path)
+        finally:
+            if f:
+                f.close()
+        try:
+            magic, version, self.__count, self.__width, self.__total_size, self.__next_address, self.__module_num = HEADER.unpack_from(self.__data)
+        except struct.error:
+            raise LinkError("\"%s\" is not a valid export file." % path)
+        self.__record_size = self.__width + ADDRESS.size
+        if magic != EXPORT_MAGIC or version != EXPORT_VERSION or \
+           len(self.__data) != HEADER.size + self.__count * self.__record_size:
+            raise LinkError("\"%s\" is not a valid export file." % path)
+
+    @property
+    def path(self):
+        return self.__path
+
+    @property
+    def total_size(self):
+        return self.__total_size
+
+    @property
+    def next_address(self):
+        return self.__next_address
+
+    @property
+    def module_num(self):
+        return self.__module_num
+
+    def __len__(self):
+        return self.__count
+
+    def _record(self, i):
+        """
+        Return a tuple (variable, absolute address) of the i-th record
+        """
+        offset = HEADER.size + i * self.__record_size
+        name = self.__data[offset:offset + self.__width].rstrip("\0")
+        return name, ADDRESS.unpack_from(self.__data, offset + self.__width)[0]
+
+    def lookup(self, var):
+        """
+        Return the absolute address (as a string) of var, or None if it is not exported
+        """
+        lo, hi = 0, self.__count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            name, addr = self._record(mid)
+            if name < var:
+                lo = mid + 1
+            elif name > var:
+                hi = mid
+            else:
+                return str(addr)
+        return None
+
+    def __contains__(self, var):
+        return self.lookup(var) is not None
+
+    def items(self):
+        """
+        Return a list of tuples (variable, absolute address as a string) sorted by variable
+        """
+        r = []
+        for i in range(self.__count):
+            name, addr = self._record(i)
+            r.append((name, str(addr)))
+        return r
+
+def createExport(symbol_table, total_size, next_address, module_num):
+    """
+    Return the content of an export file
+
+    @param symbol_table: a dictionary mapping variables to absolute addresses
+    @param total_size: summed size of all prelinked modules
+    @param next_address: base address for the first module linked against the export
+    @param module_num: number of the last prelinked module
+    """
+    items = sorted([(var, int(value)) for var, value in symbol_table.items()])
+    width = max([len(t[0]) for t in items] or [0])
+    r = [HEADER.pack(EXPORT_MAGIC, EXPORT_VERSION, len(items), width, total_size, next_address, module_num)]
+    for var, addr in items:
+        r.append(var.ljust(width, "\0") + ADDRESS.pack(addr))
+    return "".join(r)
+
+if __name__ == '__main__':
+    utilities.output.warning("Please run main.py script from project's directory.")
@@ -1,11 +1,16 @@
 # -*- coding: utf-8  -*-
-import sys
 import collections
 import utilities
 
 # constants
 MACHINE_MEMOERY_SIZE = 600
 
+class LinkError(Exception):
+    """
+    LinkError: raised on any error that stops the linking process
+    """
+    pass
+
 class RawModule(object):
     """
     RawModule: a single module which contains the raw-parsed Def list, Use list and Code
@@ -68,6 +73,8 @@ class Module(RawModule):
         super(Module, self).__init__(number)
         self.__base_address = base
         self.__next_address = 0 
+        self.__original = None  # first module with an identical body if this module is a copy
+        self.__decoded = None   # tuple (def vars, code map) decoded once if the body is shared
     
     @property
     def base_address(self):
@@ -89,11 +96,28 @@ class Module(RawModule):
     @property
     def size(self):
         return int(self.code[0])
+
+    @property
+    def original(self):
+        return self.__original
+
+    def shareBody(self, original):
+        """
+        Make this module a copy of original, whose Def list, Use list and Code are identical;
+        the lists and their decoded maps are kept once for all copies
+        """
+        self.def_list, self.use_list, self.code = original.def_list, original.use_list, original.code
+        if original.__decoded is None:
+            original.__decoded = (utilities.list2dict(original.def_list[1:]), utilities.list2tuplelist(original.code[1:]))
+        self.__original = original
         
     def getDefVars(self):
         """
         Return an ordered dictionary mapping variables to values in the Def list
         """
+        body = self.__original or self
+        if body.__decoded is not None:
+            return body.__decoded[0]
         return utilities.list2dict(self.def_list[1:])
         
     def getUseVars(self):
@@ -106,6 +130,9 @@ class Module(RawModule):
         """
         Return a list of tuples mapping codes to addresses in Code
         """
+        body = self.__original or self
+        if body.__decoded is not None:
+            return body.__decoded[1]
         return utilities.list2tuplelist(self.code[1:])
 
     def _getNextAddress(self):
@@ -122,13 +149,14 @@ class LinkedModule(object):
     """
     LinkedModule: a to-be-linked (processed) module object instantiated in Modules class
     """
-    def __init__(self, number, base, def_vars=collections.OrderedDict(), use_vars=[], code_map=[], use_vals=collections.OrderedDict()):
+    def __init__(self, number, base, def_vars=None, use_vars=None, code_map=None, use_vals=None):
         self.__number = number      # integer
         self.__base_address = base  # integer
-        self.__defVars = def_vars
-        self.__useVars = use_vars
-        self.__codeMap = code_map
-        self.__useVals = use_vals   # dictionary mapping variables to values (from symbol table) in Use list
+        self.__defVars = def_vars if def_vars is not None else collections.OrderedDict()
+        self.__useVars = use_vars if use_vars is not None else []
+        self.__codeMap = code_map if code_map is not None else []
+        self.__useVals = use_vals if use_vals is not None else collections.OrderedDict()
+                                    # dictionary mapping variables to values (from symbol table) in Use list
                                     # elements in the same order to those of use_vars
         self.__rlcFlag = False
         self.__rsvFlag = False
@@ -189,8 +217,7 @@ class LinkedModule(object):
                 abs_addr = int(t[1]) + self.base_address
                 addr = str(abs_addr)
                 if int(addr[1:]) >= MACHINE_MEMOERY_SIZE:
-                    LinkerErrors.absAddExceedRlc(addr, t[1], self.number) # call absAddExceedRlc with relocated address and original address of R
-                    sys.exit(1)
+                    raise LinkError(LinkerErrors.absAddExceedRlc(addr, t[1], self.number)) # call absAddExceedRlc with relocated address and original address of R
                 rlc_map.append((t[0], addr))
             else:
                 rlc_map.append((t[0], t[1]))
@@ -231,24 +258,34 @@ class Modules(object):
         * Generating final output
         * Handling exceptions
     """
-    def __init__(self, modules, verbose):
+    def __init__(self, modules, verbose, exports=None, check_warnings=True, bulk_check=False):
         """
         Initializing with "modules", which is a list of Module objects 
         with correct base addresses, thus its elements order is relevant
         
         @param modules: a list of module objects
+        @param exports: an ExportFile of prelinked modules the modules are linked against
+        @param check_warnings: if False, skip analysis of linker warnings
+        @param bulk_check: if True and NumPy is installed, check values and addresses as arrays
         """
         self.__modules = modules    # raw modules
+        self.__exports = exports
         self.__linked_modules = []  # list of modules that are processed (after relocation and resolving)
         self.__symbol_table = collections.OrderedDict()
         self.__number = 0
         # configurations (boolean)
         self.verbose = verbose
+        self.check_warnings = check_warnings
+        self.__words = None  # bulk.WordArrays of all values and addresses, if checked as arrays
+        if bulk_check:
+            import bulk  # imported only when needed, as importing NumPy slows down startup
+            if bulk.numpy is not None:
+                self.__words = bulk.WordArrays(uniqueBodies(modules), MACHINE_MEMOERY_SIZE)
 
         # actions upon initialization
         self._syntaxCheck()  # preliminary syntax check upon initialization
         
-        self.__linker_errors = LinkerErrors(modules)  # initialize linker errors
+        self.__linker_errors = LinkerErrors(modules, exports, self.__words)  # initialize linker errors
         self.__linker_warnings = None  # initialize linker warnings in self.__catch_warnings()
         self._catch()  # catch errors and warnings
         self._generateSymbolTable() # generate symbol table
@@ -263,38 +300,12 @@ class Modules(object):
         if self.verbose:
             utilities.output.debug("Checking module syntax and validity of values and addresses...")
             
-        for mod in self.__modules:
-            # checking values
-            values = mod.getDefVars().items()
-            num = mod.number
-            for v in values:
-                # v[0]: variable name
-                # v[1]: value
-                try:
-                    #if int(v[1]) > mod.size:
-                        #print  "Invalid value for variable %s: %d in Def list of Module %d. Must be within its module size." %(v[0], v[1], num)
-                        #sys.exit(1)
-                    int(v[1])
-                        
-                except ValueError:
-                    print "Invalid value for variable %s: %d in Def list of Module %d. Must be an integer." %(v[0], v[1], num)
-                    sys.exit(1)
-                    
-            # checking addresses
-            addrs = mod.getCodeMap()
-            for a in addrs:
-                # a[0]: code (I/A/R/E)
-                # a[1]: address
-                try:
-                    int(a[1])
-                    if len(a[1]) != 4:
-                        print "Invalid address for %s: %d in Code of Module %d. Must be a 4-digit word." %(a[0], a[1], num)
-                        sys.exit(1)
-                        
-                except ValueError:
-                    print "Invalid address for %s: %d in Code of Module %d. Must be an integer." %(a[0], a[1], num)
-                    sys.exit(1)
-    
+        if self.__words is None:
+            syntaxCheck(self.__modules)
+        else:
+            # only the modules with a candidate are checked word by word, for the message
+            unique = uniqueBodies(self.__modules)
+            syntaxCheck([unique[i] for i in self.__words.syntaxCandidates()])
     
     def _catch(self):
         """
@@ -315,7 +326,8 @@ class Modules(object):
         dvl = self.__linker_errors.def_var_list
         uvl = self.__linker_errors.use_var_list
         self.__linker_warnings = LinkerWarnings(self.__modules, dvl, uvl)  # initialize LinkerWarnings with modules, def_var_list and use_var_list
-        self.__linker_warnings.process()
+        if self.check_warnings:
+            self.__linker_warnings.process()
          
     @property
     def symbol_table(self):
@@ -331,22 +343,21 @@ class Modules(object):
         """
         if self.verbose:
             utilities.output.debug("Generating Symbol Table...")
-        for mod in self.__modules:
-            def_vars = mod.getDefVars()
-            base = mod.base_address
-            if def_vars:
-                for v in def_vars.items():
-                    self.__symbol_table.update([(v[0], str(int(v[1]) + base))])
+        self.__symbol_table = generateSymbolTable(self.__modules)
+    
+    def symbolValue(self, var):
+        """
+        Return the value of var from the symbol table or the prelinked exports
+        """
+        if var in self.__symbol_table or self.__exports is None:
+            return self.__symbol_table[var]
+        return self.__exports.lookup(var)
     
     def formatSymbolTable(self):
         """
         Return formatted Symbol Table with "=" for each variable
         """
-        pst = []
-
-        for t in self.symbol_table.items():
-            pst.append(t[0] + "=" + t[1])
-        return "\n".join(pst)
+        return formatSymbolTable(self.symbol_table)
         
     def processModules(self):
         """
@@ -363,13 +374,26 @@ class Modules(object):
             use_vals = collections.OrderedDict()
 
             for var in use_vars:
-                use_vals.update([(var, self.symbol_table[var])])
+                use_vals.update([(var, self.symbolValue(var))])
             lmod = LinkedModule(mod.number, mod.base_address, def_vars, use_vars, code_map, use_vals)
             lmod.process()
             self.__linked_modules.append(lmod)
             
         self.__number = len(self.__linked_modules)  # update number of modules linked
     
+    def checkRelocation(self):
+        """
+        Check relocated R addresses against the machine size, as processModules() does,
+        without building LinkedModule objects
+        """
+        for mod in self.__modules:
+            base = mod.base_address
+            for t in mod.getCodeMap():
+                if t[0] == "R":
+                    addr = str(int(t[1]) + base)
+                    if int(addr[1:]) >= MACHINE_MEMOERY_SIZE:
+                        raise LinkError(LinkerErrors.absAddExceedRlc(addr, t[1], mod.number))
+    
     @property
     def number(self):
         """
@@ -390,54 +414,176 @@ class Modules(object):
             
         return "\n".join(r)
     
+    @property
+    def start_address(self):
+        """
+        Return the base address of the first module, i.e. the index of the first address in memory
+        """
+        return self.__modules[0].base_address if self.__modules else 0
+    
+    def image(self):
+        """
+        Return a list of the addresses of all processed modules in memory order
+        """
+        addrs = []
+        for m in self.__linked_modules:
+            addrs += [t[1] for t in m.code_map]  # retrieve address in every tuple in code_map
+        return addrs
+    
     def output(self):
         """
         Return formatted output of processed modules (to be dumped in a text file)
         """
-        ind = 0  # starting index
-        next = 0 # base index for next module in the following loop
-        add_index = [] # list of tuples of indexes and addresses, e.g. [(0, 7002), (1, 1004), (2, 4033), ...]
-        
-        for m in self.__linked_modules:
-            nums = [next + i for i in range(m.code_map_num)]
-            addrs = [t[1] for t in m.code_map]  # retrieve address in every tuple in code_map
-            next += m.code_map_num
-            add_index += zip(nums, addrs)
-            
-        vars = [t[0] for t in self.symbol_table.items()]  # retrieve variable in symbol table
-        var_max_len = len(max(vars, key=len))  # length of longest string
-        tj = []  # temporary list to be joined
-
-        for t in add_index:
-            fmt = "{:<%s}" % var_max_len  # left-align format width
-            tj.append(fmt.format(str(t[0]) + ':') + ' ' + t[1])
-
-        return self.formatSymbolTable() + "\n\n" + "\n".join(tj) + "\n"
+        return formatOutput(self.symbol_table, self.image(), self.start_address)
     
     def outputWarnings(self):
         return self.__linker_warnings.output()
     
+    @property
+    def warnings(self):
+        """
+        Return a list of warning messages caught upon initialization
+        """
+        return self.__linker_warnings.messages
+    
+    @property
+    def linker_warnings(self):
+        return self.__linker_warnings
+    
     def outputHuman(self):
         """
         Return human readable output of processed modules
         """
-        return "Symbol Table\n" + self.formatSymbolTable() + "\n" + self.formatLinkedModules()         
+        return "".join(self.iterHuman())
+
+    def iterHuman(self, numbers=None, symbol=None):
+        """
+        Generate human readable output of processed modules piece by piece,
+        formatting only the selected modules, one at a time
+
+        @param numbers: a tuple (first, last) of module numbers to show; all modules if None
+        @param symbol: a variable; if given, show only modules defining or using it
+        """
+        selected = [m for m in self.__linked_modules
+                    if (numbers is None or numbers[0] <= m.number <= numbers[1]) and
+                       (symbol is None or symbol in m.def_vars or symbol in m.use_vars)]
+        symbol_table = self.symbol_table
+        if numbers is not None or symbol is not None:
+            # only the variables defined in the selected modules
+            defined = set([v for m in selected for v in m.def_vars])
+            symbol_table = collections.OrderedDict([t for t in symbol_table.items() if t[0] in defined])
+        yield "Symbol Table\n" + formatSymbolTable(symbol_table) + "\n"
+        for i, m in enumerate(selected):
+            yield ("\n" if i else "") + str(m)
       
     def __str__(self):
         return self.outputHuman()
 
   
+
+def syntaxCheck(modules):
+    """
+    Preliminary syntax checking of a list of Module objects for validity of values
+    and addresses, i.e. whether values are integers and addresses are 4-digit words
+    """
+    for mod in uniqueBodies(modules):
+        # checking values
+        values = mod.getDefVars().items()
+        num = mod.number
+        for v in values:
+            # v[0]: variable name
+            # v[1]: value
+            try:
+                #if int(v[1]) > mod.size:
+                    #print  "Invalid value for variable %s: %d in Def list of Module %d. Must be within its module size." %(v[0], v[1], num)
+                    #sys.exit(1)
+                int(v[1])
+                    
+            except ValueError:
+                raise LinkError("Invalid value for variable %s: %s in Def list of Module %d. Must be an integer." %(v[0], v[1], num))
+                
+        # checking addresses
+        addrs = mod.getCodeMap()
+        for a in addrs:
+            # a[0]: code (I/A/R/E)
+            # a[1]: address
+            try:
+                int(a[1])
+            except ValueError:
+                raise LinkError("Invalid address for %s: %s in Code of Module %d. Must be an integer." %(a[0], a[1], num))
+            if len(a[1]) != 4:
+                raise LinkError("Invalid address for %s: %s in Code of Module %d. Must be a 4-digit word." %(a[0], a[1], num))
+
+def uniqueBodies(modules):
+    """
+    Return the modules of a list whose bodies are not identical to that of a module before them,
+    i.e. the modules to be checked once for all their copies
+    """
+    seen = set()  # set of ids of the first modules with each body
+    r = []
+    for mod in modules:
+        body = mod.original or mod
+        if id(body) not in seen:
+            seen.add(id(body))
+            r.append(mod)
+    return r
+
+def generateSymbolTable(modules):
+    """
+    Return Symbol Table (an ordered dictionary mapping variables to their calculated values)
+    of a list of Module objects, without any other checking
+    """
+    symbol_table = collections.OrderedDict()
+    for mod in modules:
+        def_vars = mod.getDefVars()
+        base = mod.base_address
+        if def_vars:
+            for v in def_vars.items():
+                try:
+                    symbol_table.update([(v[0], str(int(v[1]) + base))])
+                except ValueError:
+                    raise LinkError("Invalid value for variable %s: %s in Def list of Module %d. Must be an integer." %(v[0], v[1], mod.number))
+    return symbol_table
+
+def formatSymbolTable(symbol_table):
+    """
+    Return formatted Symbol Table with "=" for each variable
+    """
+    pst = []
+
+    for t in symbol_table.items():
+        pst.append(t[0] + "=" + t[1])
+    return "\n".join(pst)
+
+def formatOutput(symbol_table, addrs, start=0):
+    """
+    Return formatted output of a symbol table and a list of addresses (to be dumped in a text file)
+
+    @param start: index of the first address in memory
+    """
+    vars = [t[0] for t in symbol_table.items()]  # retrieve variable in symbol table
+    var_max_len = len(max(vars, key=len)) if vars else 1  # length of longest string
+    fmt = "{:<%s}" % var_max_len  # left-align format width
+    tj = []  # temporary list to be joined
+
+    for t in enumerate(addrs, start):
+        tj.append(fmt.format(str(t[0]) + ':') + ' ' + t[1])
+
+    return formatSymbolTable(symbol_table) + "\n\n" + "\n".join(tj) + "\n"
         
 class LinkerErrors(object):
     """
     LinkerErrors
     """
     
-    def __init__(self, modules):
+    def __init__(self, modules, exports=None, words=None):
         """
-        Initialize with modules list
+        Initialize with modules list, the ExportFile of prelinked modules if any,
+        and the bulk.WordArrays of the modules if checked as arrays
         """
         self.__modules = modules
+        self.__exports = exports
+        self.__words = words
         self.__def_vars_list = []
         self.__use_vars_list = []
         
@@ -447,10 +593,14 @@ class LinkerErrors(object):
         """
         self._multiDef()
         self._useVarUndef()
-        self._defVarExceed()
-        self._extAddExceed()
-        self._absAddExceed()
-        self._relAddExceed()
+        if self.__words is not None and self.__words.exact:
+            for rule in self.__words.violations():
+                getattr(self, rule)()  # the per-item check raises the error of the first offending word
+        else:
+            self._defVarExceed()
+            self._extAddExceed()
+            self._absAddExceed()
+            self._relAddExceed()
         self._netModExceed()
         
     def __locateError(self, module, kind_number):
@@ -475,10 +625,11 @@ class LinkerErrors(object):
                 all_def_vars += vars
         
         dp = utilities.getduplicate(all_def_vars)  # find all duplicate variables
+        if self.__exports is not None:
+            dp += [v for v in all_def_vars if v in self.__exports]  # defined again after prelinking
         if dp:
             for d in dp:
-                utilities.output.error("%s multiply defined" % d)
-                sys.exit(1)
+                raise LinkError("%s multiply defined" % d)
         else:
             self.__def_vars_list = all_def_vars
             return
@@ -497,9 +648,8 @@ class LinkerErrors(object):
         all_use_vars = list(set(all_use_vars))  # remove duplicate elements
         
         for v in all_use_vars:
-            if v not in self.__def_vars_list:
-                utilities.output.error("%s used but not defined" % v)
-                sys.exit(1)
+            if v not in self.__def_vars_list and (self.__exports is None or v not in self.__exports):
+                raise LinkError("%s used but not defined" % v)
                 
         self.__use_vars_list = all_use_vars
         return
@@ -510,13 +660,12 @@ class LinkerErrors(object):
         print an error message specifying the given address and the module size and exit.
         """
         
-        for mod in self.__modules:
+        for mod in uniqueBodies(self.__modules):  # copies break the rules as their first module
             def_vars = mod.getDefVars()
             size = mod.size
             for t in def_vars.items():
                 if int(t[1]) >= size:
-                    utilities.output.error("address %s exceeds the module size of %d" % (t[1], size) + self.__locateError(mod, 1))
-                    sys.exit(1)
+                    raise LinkError("address %s exceeds the module size of %d" % (t[1], size) + self.__locateError(mod, 1))
         return 
                     
         
@@ -526,7 +675,7 @@ class LinkerErrors(object):
         print an error message specifying the variable and exit.
         """
         
-        for mod in self.__modules:
+        for mod in uniqueBodies(self.__modules):
             use_vars = mod.getUseVars()
             use_vars_num = len(use_vars)
             code_map = mod.getCodeMap()
@@ -535,11 +684,9 @@ class LinkerErrors(object):
                     ind = int(t[1][1:])  # index represented in the rightmost 3-digit of External Address
                     if use_vars_num:
                         if ind >= use_vars_num:
-                            utilities.output.error("external address %s is too large to reference an entry in the use list" % t[1] + self.__locateError(mod, 3))
-                            sys.exit(1)
+                            raise LinkError("external address %s is too large to reference an entry in the use list" % t[1] + self.__locateError(mod, 3))
                     else:
-                        utilities.output.error("external address %s is unable to reference any entry because the use list is empty" % t[1] + self.__locateError(mod, 3))
-                        sys.exit(1)
+                        raise LinkError("external address %s is unable to reference any entry because the use list is empty" % t[1] + self.__locateError(mod, 3))
                         
         return
     
@@ -549,37 +696,36 @@ class LinkerErrors(object):
         print an error message specifying that address and exit.
             Check before relocation
         """
-        for mod in self.__modules:
+        for mod in uniqueBodies(self.__modules):
             code_map = mod.getCodeMap()
             for t in code_map:
                 if t[0] == "A":
                     ind = int(t[1][1:])  # index represented in the rightmost 3-digit of Absolute Address
                     if ind >= MACHINE_MEMOERY_SIZE:
-                        utilities.output.error("absolute address %s exceeds the size of the machine" % t[1] + self.__locateError(mod, 3))
-                        sys.exit(1)
+                        raise LinkError("absolute address %s exceeds the size of the machine" % t[1] + self.__locateError(mod, 3))
         return
     
     @staticmethod
     def absAddExceedRlc(abs_addr, ori_addr, number):
         """
-            Called if relocated R address is larger than machine memory size
+            Called if relocated R address is larger than machine memory size;
+            return the error message
         """
-        return utilities.output.error("relocated absolute address %s (original R address: %s) exceeds the size of machine" % (abs_addr, ori_addr) + " (Module %d: Code)" % number)
+        return "relocated absolute address %s (original R address: %s) exceeds the size of machine" % (abs_addr, ori_addr) + " (Module %d: Code)" % number
         
     def _relAddExceed(self):
         """
         If a relative address exceeds the size of the module,
         print an error specifying that address and exit.
         """
-        for mod in self.__modules:
+        for mod in uniqueBodies(self.__modules):
             code_map = mod.getCodeMap()
             size = mod.size
             for t in code_map:
                 if t[0] == "R":
                     ind = int(t[1][1:])  # index represented in the rightmost 3-digit of Absolute Address
                     if ind >= size:
-                        utilities.output.error("relative address %s exceeds the size of the module" % t[1] + self.__locateError(mod, 3))
-                        sys.exit(1)
+                        raise LinkError("relative address %s exceeds the size of the module" % t[1] + self.__locateError(mod, 3))
         return
     
     def _netModExceed(self):
@@ -587,12 +733,11 @@ class LinkerErrors(object):
         If the sum of all modules size exceeds the machine size,
         print an error
         """
-        sum_size = 0
+        sum_size = self.__exports.next_address if self.__exports is not None else 0  # prelinked modules come first
         for mod in self.__modules:
             sum_size += mod.size
         if sum_size > MACHINE_MEMOERY_SIZE:
-            utilities.output.error("The summed size of all modules, which is %d, exceeds the size of machine" % sum_size)
-            sys.exit(1)
+            raise LinkError("The summed size of all modules, which is %d, exceeds the size of machine" % sum_size)
             
     @property
     def def_var_list(self):
@@ -616,6 +761,7 @@ class LinkerWarnings(object):
         self.__use_warnings = None
         self.__def_vars = def_vars_list
         self.__use_vars = use_vars_list
+        self.__messages = []  # list of warning messages in the order caught
     
     def process(self):
         """
@@ -639,7 +785,7 @@ class LinkerWarnings(object):
                 for v in def_vars:
                     if v[0] not in use_vars_list:
                         def_warnings.append((v[0], number))
-                        utilities.output.warning("%s was defined in Module %d but was never used" % (v[0], number))
+                        self.__messages.append("%s was defined in Module %d but was never used" % (v[0], number))
         
             self.__def_warnings = def_warnings
             
@@ -653,24 +799,49 @@ class LinkerWarnings(object):
         print a warning message and continue.
         """
         use_warnings = []  # list of tuples (variable, module_number)
+        unused = {}  # dictionary mapping ids of first modules to their unused variables, shared by copies
         for mod in self.__modules:
-            use_vars = mod.getUseVars()
-            code_map = mod.getCodeMap()
             number = mod.number
-            all_ind = range(len(use_vars)) # list of entry indexes to be referred to in E address 
-            used_ind = []
-            for t in code_map:
-                if t[0] == "E":
-                    ind = int(t[1][1:])  # index represented in the rightmost 3-digit of External Address
-                    used_ind.append(ind)  # collect used indexes
-            unused_ind = list(set(all_ind) - set(used_ind))
-            unused_vars = [use_vars[ind] for ind in unused_ind]  # list of unused variables in the current module
+            body = id(mod.original or mod)
+            if body not in unused:
+                use_vars = mod.getUseVars()
+                code_map = mod.getCodeMap()
+                all_ind = range(len(use_vars)) # list of entry indexes to be referred to in E address 
+                used_ind = []
+                for t in code_map:
+                    if t[0] == "E":
+                        ind = int(t[1][1:])  # index represented in the rightmost 3-digit of External Address
+                        used_ind.append(ind)  # collect used indexes
+                unused_ind = list(set(all_ind) - set(used_ind))
+                unused[body] = [use_vars[ind] for ind in unused_ind]
+            unused_vars = unused[body]  # list of unused variables in the current module
             if unused_vars:
                 use_warnings.append((unused_vars, number))
                 for v in unused_vars:
-                    utilities.output.warning("%s appeared in the use list in Module %d but not used" % (v, number))
+                    self.__messages.append("%s appeared in the use list in Module %d but not used" % (v, number))
         
         self.__use_warnings = use_warnings
+    
+    @property
+    def messages(self):
+        """
+        Return a list of warning messages caught
+        """
+        return self.__messages
+    
+    @property
+    def def_warnings(self):
+        """
+        Return a list of tuples (variable, module_number) defined but never used
+        """
+        return self.__def_warnings or []
+    
+    @property
+    def use_warnings(self):
+        """
+        Return a list of tuples (variable, module_number) in a use list but not used
+        """
+        return [(v, t[1]) for t in self.__use_warnings or [] for v in t[0]]
         
     def output(self):
         """
@@ -0,0 +1,220 @@
+# -*- coding: utf-8  -*-
+import os
+import re
+import sys
+import thread
+import threading
+import contextlib
+import utilities
+from linker import LinkError
+try:
+    import resource
+except ImportError:
+    resource = None     # not available on Windows; memory is not measured
+try:
+    import ctypes
+except ImportError:
+    ctypes = None       # overruns are then reported at the end of the stage
+
+# constants
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+SAMPLE_INTERVAL = 0.005  # seconds between two samples of the resident set size during a stage
+
+class MemoryBudgetExceeded(LinkError):
+    """
+    MemoryBudgetExceeded: raised when the memory usage of a stage crosses the budget
+    """
+    def __init__(self, stage, usage, budget, projected=False):
+        self.stage = stage
+        self.usage = usage
+        self.budget = budget
+        self.projected = projected
+        kind = "projected memory usage" if projected else "memory usage"
+        super(MemoryBudgetExceeded, self).__init__("%s of %s exceeds the memory budget of %s at stage \"%s\"" % (kind, formatSize(usage), formatSize(budget), stage))
+
+def parseSize(s):
+    """
+    Convert a size such as "512M", "2G" or "65536" into a number of bytes
+    """
+    m = re.match(r"^\s*(\d+)\s*([KMG]?)B?\s*$", s.upper())
+    if not m:
+        raise ValueError("Invalid size \"%s\". Must be an integer with an optional K, M or G suffix." % s)
+    return int(m.group(1)) * SIZE_UNITS[m.group(2)]
+
+def formatSize(n):
+    """
+    Return a human readable size, e.g. 1536 --> "1.5K"
+    """
+    for unit in ["G", "M", "K"]:
+        if abs(n) >= SIZE_UNITS[unit]:
+            return "%.1f%s" % (float(n) / SIZE_UNITS[unit], unit)
+    return "%d" % n
+
+class _BudgetInterrupt(BaseException):
+    """
+    _BudgetInterrupt: raised asynchronously in the thread of a stage crossing the budget;
+    a BaseException, so that no "except Exception" of the stage can swallow it
+    """
+    pass
+
+def _rss():
+    """
+    Return the current resident set size of this process in bytes;
+    the process-wide peak where the current size cannot be read
+    """
+    try:
+        f = open("/proc/self/statm", "r")
+        try:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        finally:
+            f.close()
+    except (IOError, OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        peak *= 1024  # ru_maxrss is in kilobytes except on Mac OS X
+    return peak
+
+class _Sampler(threading.Thread):
+    """
+    _Sampler: thread sampling the resident set size during a stage
+        * Records the highest size sampled
+        * Interrupts the thread running the stage as soon as a sample exceeds the budget
+    """
+    def __init__(self, start, budget, owner):
+        """
+        @param start: resident set size at the start of the stage
+        @param budget: memory budget in bytes; None for no budget
+        @param owner: identifier of the thread running the stage
+        """
+        super(_Sampler, self).__init__()
+        self.daemon = True
+        self.budget = budget
+        self.owner = owner
+        self.peak = start
+        self.exceeded = False
+        self.__done = threading.Event()
+
+    def run(self):
+        while not self.__done.is_set():
+            self.sample()
+            if self.exceeded:
+                if ctypes is not None:
+                    ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_long(self.owner), ctypes.py_object(_BudgetInterrupt))
+                return
+            self.__done.wait(SAMPLE_INTERVAL)
+
+    def sample(self):
+        """
+        Sample the resident set size once and return it
+        """
+        current = _rss()
+        self.peak = max(self.peak, current)
+        if self.budget is not None and current > self.budget:
+            self.exceeded = True
+        return current
+
+    def stop(self):
+        self.__done.set()
+        self.join()
+
+class MemoryTracker(object):
+    """
+    MemoryTracker: peak and retained memory accounting per pipeline stage
+        * Resident set size sampled on a thread while a stage runs
+        * Peak and retained memory relative to the start of every stage
+        * Budget checks before (projected), during and after (actual) every stage
+
+    The resident set size is process-wide; stages of concurrent links in
+    one process are accounted together. An overrun stops the stage in the
+    thread running it, not in the main thread.
+    """
+    def __init__(self, budget=None, verbose=False, enabled=True):
+        """
+        @param budget: memory budget in bytes; None for no budget
+        @param enabled: if False, stages are neither accounted nor checked
+        """
+        self.budget = budget
+        self.verbose = verbose
+        self.enabled = enabled
+        self.__stages = []  # list of tuples (stage, peak, retained)
+
+    @property
+    def method(self):
+        return "RSS"
+
+    @property
+    def stages(self):
+        return self.__stages
+
+    def usage(self):
+        """
+        Return the current memory usage in bytes
+        """
+        return _rss()
+
+    def project(self, stage, extra):
+        """
+        Check the budget before a stage expected to allocate extra bytes
+        """
+        if not self.enabled or self.budget is None:
+            return
+        projected = self.usage() + max(extra, 0)
+        if projected > self.budget:
+            raise MemoryBudgetExceeded(stage, projected, self.budget, True)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        Account the memory of the enclosed pipeline stage and check the budget;
+        a stage crossing the budget (or running out of memory) is stopped where it is
+        """
+        if not self.enabled:
+            yield
+            return
+        before = self.usage()
+        if self.budget is not None and before > self.budget:
+            raise MemoryBudgetExceeded(name, before, self.budget)
+        sampler = _Sampler(before, self.budget, thread.get_ident())
+        sampler.start()
+        try:
+            try:
+                yield
+            finally:
+                sampler.stop()
+            current = sampler.sample()
+        except _BudgetInterrupt:
+            raise MemoryBudgetExceeded(name, sampler.peak, self.budget)
+        except MemoryError:
+            raise MemoryBudgetExceeded(name, sampler.peak, self.budget or sampler.peak)
+        self.__stages.append((name, sampler.peak - before, current - before))
+        if self.verbose:
+            utilities.output.debug("Memory at stage \"%s\": peak %s, retained %s (%s)" % (name, formatSize(sampler.peak - before), formatSize(current - before), self.method))
+        if sampler.exceeded:
+            raise MemoryBudgetExceeded(name, sampler.peak, self.budget)
+
+    def retained(self, name):
+        """
+        Return the retained bytes of the stage specified by name, or 0
+        """
+        for t in self.__stages:
+            if t[0] == name:
+                return t[2]
+        return 0
+
+    def report(self):
+        """
+        Return formatted memory report of all stages accounted;
+        peak and retained memory are relative to the start of every stage
+        """
+        width = max([len(t[0]) for t in self.__stages] + [len("Stage")])
+        fmt = "{:<%d}  {:>10}  {:>10}" % width
+        r = ["Memory (%s)" % self.method, fmt.format("Stage", "Peak", "Retained")]
+        for t in self.__stages:
+            r.append(fmt.format(t[0], formatSize(t[1]), formatSize(t[2])))
+        return "\n".join(r)
+
+if __name__ == '__main__':
+    utilities.output.warning("Please run main.py script from project's directory.")
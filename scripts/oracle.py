@@ -0,0 +1,464 @@
+# -*- coding: utf-8  -*-
+import os
+import zlib
+import random
+import tempfile
+import StringIO
+import collections
+import utilities
+import api
+import streams
+import shard
+import bulk
+import delta
+import export
+import reference
+import relocation
+from linker import Modules, LinkError, MACHINE_MEMOERY_SIZE
+from parsing import splitInput, parseList, parseTokens
+
+"""
+Differential testing of linker engines against the reference engine
+    * An engine is a function taking input text and returning an outcome
+    * An outcome is a tuple ("ok", symbol table items, image, warnings),
+      ("error", message) or ("crash", exception type name)
+    * Round-trip engines transform the output of a clean link and check it
+      against another path; a broken round trip is ("roundtrip", description)
+"""
+
+# rules covered by the random corpus; None for a valid input
+RULES = [None,
+         "defVarUnuse", "useVarUnuse",                       # LinkerWarnings
+         "multiDef", "useVarUndef", "defVarExceed",          # LinkerErrors
+         "extAddExceed", "extAddEmpty", "absAddExceed",
+         "relAddExceed", "netModExceed",
+         "valueSyntax", "addressSyntax", "addressWidth",     # Modules._syntaxCheck
+         "startIndex", "structure"]                          # parseList
+
+def _outcome(func, text):
+    """
+    Return the outcome of func(text), which returns a LinkResult
+    """
+    try:
+        r = func(text)
+    except LinkError as e:
+        return ("error", str(e))
+    except Exception as e:
+        return ("crash", type(e).__name__)
+    return ("ok", r.symbol_table.items(), r.image, r.warnings)
+
+def referenceEngine(text):
+    """
+    Reference oracle; links on the frozen path of reference.py, never on the engines' code
+    """
+    try:
+        modules = reference.link(text)
+    except LinkError as e:
+        return ("error", str(e))
+    except Exception as e:
+        return ("crash", type(e).__name__)
+    return ("ok", modules.symbol_table.items(), modules.image(), modules.warnings)
+
+def _listLink(text):
+    """
+    The list-based path of linker.py: parseList --> Modules --> LinkedModule.process
+    """
+    modules = Modules(parseList(splitInput(text)), False)
+    modules.processModules()
+    return api.LinkResult(modules)
+
+def listEngine(text):
+    """
+    Engine linking a token list parsed with parseList()
+    """
+    return _outcome(_listLink, text)
+
+def apiEngine(text):
+    """
+    Engine linking through api.link()
+    """
+    return _outcome(api.link, text)
+
+def _streamLink(text):
+    """
+    Link text compressed with zlib through the streaming tokenizer, in small chunks
+    """
+    f = streams.openStream(StringIO.StringIO(zlib.compress(text)))
+    modules = Modules(parseTokens(streams.iterTokens(f, 7)), False)
+    modules.processModules()
+    return api.LinkResult(modules)
+
+def streamEngine(text):
+    """
+    Engine parsing a compressed stream with parseTokens()
+    """
+    return _outcome(_streamLink, text)
+
+def _shardLink(text):
+    """
+    Link text split into shards of two modules, in this process
+    """
+    modules = parseTokens(iter(splitInput(text)))
+    return api.LinkResult(shard.link(modules, shard.SerialTransport(), -(-len(modules) // 2)))
+
+def shardEngine(text):
+    """
+    Engine linking shard by shard with shard.link()
+    """
+    return _outcome(_shardLink, text)
+
+def _bulkLink(text):
+    """
+    Link text checking values and addresses as arrays
+    """
+    modules = Modules(parseTokens(iter(splitInput(text))), False, bulk_check=True)
+    modules.processModules()
+    return api.LinkResult(modules)
+
+def bulkEngine(text):
+    """
+    Engine checking values and addresses with bulk.WordArrays
+    """
+    return _outcome(_bulkLink, text)
+
+def _linkModules(text, base=0, exports=None):
+    """
+    Link text with its modules based from base and return a tuple (list of Module objects, processed Modules)
+    """
+    mods = parseTokens(iter(splitInput(text)), False, 1, base)
+    modules = Modules(mods, False, exports)
+    modules.processModules()
+    return mods, modules
+
+def _relocatable(mods, modules):
+    """
+    Return the relocatable output of processed modules, as saved with --relocatable
+    """
+    records = relocation.relocationRecords(mods, modules.symbol_table)
+    return modules.output() + "\n" + relocation.formatRelocations(records) + "\n\n" + modules.outputWarnings()
+
+def _roundTrip(text, check):
+    """
+    Return the outcome of linking text, or ("roundtrip", description) if the link is clean
+    and check(text, mods, modules) returns the description of a broken round trip
+    """
+    try:
+        mods, modules = _linkModules(text)
+        r = api.LinkResult(modules)
+    except LinkError as e:
+        return ("error", str(e))
+    except Exception as e:
+        return ("crash", type(e).__name__)
+    try:
+        broken = check(text, mods, modules)
+    except Exception as e:  # the transformed output of a clean link must not fail, not even with LinkError
+        return ("roundtrip", "%s: %s" % (type(e).__name__, e))
+    if broken:
+        return ("roundtrip", broken)
+    return ("ok", r.symbol_table.items(), r.image, r.warnings)
+
+def _previousOutput(text):
+    """
+    Return the output of text linked without its first (or else its last) module,
+    as a previous output before an edit; empty if neither links
+    """
+    modules = splitModules(text) or []
+    for mods in [modules[1:], modules[:-1]]:
+        try:
+            return api.link(formatModules(mods)).output() if mods else ""
+        except LinkError:
+            continue
+    return ""
+
+def _checkDelta(text, mods, modules):
+    old = _previousOutput(text)
+    new = modules.output() + "\n\n" + modules.outputWarnings()
+    d = delta.makeDelta(old, modules.symbol_table, modules.image(), modules.outputWarnings(), modules.start_address)
+    if delta.applyDelta(old, d) != new:
+        return "applyDelta(old, makeDelta(old, new)) differs from the new output"
+
+def deltaEngine(text):
+    """
+    Engine checking that a delta against a previous output rebuilds the full output
+    """
+    return _roundTrip(text, _checkDelta)
+
+def _checkRebase(text, mods, modules):
+    output = _relocatable(mods, modules)
+    if relocation.rebase(output, modules.start_address) != output:
+        return "rebase to the original base changes the output"
+
+def rebaseEngine(text):
+    """
+    Engine checking that rebasing a relocatable output to its own base is the identity
+    """
+    return _roundTrip(text, _checkRebase)
+
+def _checkExport(text, mods, modules):
+    size = len(modules.image())
+    new_base = (MACHINE_MEMOERY_SIZE - size) // 2
+    fd, path = tempfile.mkstemp(suffix=".ex")
+    try:
+        os.write(fd, export.createExport({}, new_base, new_base, 0))  # an export of prelinked modules ending at new_base
+        os.close(fd)
+        exports = export.ExportFile(path)
+    finally:
+        os.remove(path)
+    fresh = _relocatable(*_linkModules(text, new_base, exports))
+    if relocation.rebase(_relocatable(mods, modules), new_base) != fresh:
+        return "rebase to %d differs from a link against an export ending at %d" % (new_base, new_base)
+
+def exportEngine(text):
+    """
+    Engine checking that rebasing a relocatable output to base B matches a link against an export ending at B
+    """
+    return _roundTrip(text, _checkExport)
+
+# dictionary mapping engine names to engines to be checked against the reference
+ENGINES = {"list": listEngine, "api": apiEngine, "stream": streamEngine, "shard": shardEngine,
+           "delta": deltaEngine, "rebase": rebaseEngine, "export": exportEngine}
+if bulk.numpy is not None:
+    ENGINES["bulk"] = bulkEngine
+
+def formatModules(modules):
+    """
+    Return input text of a list of modules, each a tuple (def list, use list, code) of token lists
+    """
+    r = []
+    for m in modules:
+        for l in m:
+            r.append(" ".join([str(t) for t in l]))
+    return "\n".join(r) + "\n"
+
+def randomModules(rng, size_limit=MACHINE_MEMOERY_SIZE):
+    """
+    Return a list of random valid modules (as in formatModules) with summed size within size_limit
+    """
+    sizes = [rng.randint(1, 40) for i in range(rng.randint(1, 12))]
+    if rng.random() < 0.2:
+        sizes[-1] += size_limit - sum(sizes)  # fill the machine up to its size
+
+    symbols = []
+    defs = []
+    for i, size in enumerate(sizes):
+        d = []
+        for j in range(rng.randint(0, 3)):
+            var = "s%d_%d" % (i, j)
+            symbols.append(var)
+            d += [var, rng.randint(0, size - 1)]
+        defs.append(d)
+
+    modules = []
+    for i, size in enumerate(sizes):
+        uses = rng.sample(symbols, min(len(symbols), rng.randint(0, 3))) if symbols else []
+        code = []
+        for k in range(size):
+            kind = rng.choice("IARE" if uses else "IAR")
+            op = rng.randint(1, 9)
+            if kind == "I":
+                addr = rng.randint(1000, 9999)
+            elif kind == "A":
+                addr = op * 1000 + rng.randint(0, MACHINE_MEMOERY_SIZE - 1)
+            elif kind == "R":
+                addr = op * 1000 + rng.randint(0, size - 1)
+            else:
+                addr = op * 1000 + rng.randint(0, len(uses) - 1)
+            code += [kind, addr]
+        modules.append(([len(defs[i]) // 2] + defs[i], [len(uses)] + uses, [size] + code))
+    return modules
+
+def _codeIndexes(modules, kind=None):
+    """
+    Return a list of tuples (module index, code index) of the codes of kind (any kind if None)
+    """
+    return [(i, j) for i, m in enumerate(modules) for j in range(1, len(m[2]), 2) if kind in [None, m[2][j]]]
+
+def mutate(rng, modules, rule):
+    """
+    Return a copy of a list of valid modules changed to break (or warn on) rule,
+    or None if the modules cannot be changed so
+    """
+    mods = [(list(d), list(u), list(c)) for d, u, c in modules]
+    if rule is None:
+        return mods
+    if rule == "defVarUnuse":
+        d = mods[-1][0]
+        d[0] += 1
+        d += ["unused_%d" % rng.randint(0, 999), 0]
+    elif rule == "useVarUnuse":
+        defs = [v for m in mods for v in m[0][1::2]]
+        if not defs:
+            return None
+        u = mods[0][1]
+        u[0] += 1
+        u.append(rng.choice(defs))  # appended last, so no E address refers to it
+    elif rule == "multiDef":
+        # defined again in another module; a variable repeated in one Def list is not an error
+        defs = [(i, v) for i, m in enumerate(mods) for v in m[0][1::2]]
+        if not defs or len(mods) < 2:
+            return None
+        k, var = rng.choice(defs)
+        d = mods[rng.choice([i for i in range(len(mods)) if i != k])][0]
+        d[0] += 1
+        d += [var, 0]
+    elif rule == "useVarUndef":
+        u = mods[rng.randrange(len(mods))][1]
+        u[0] += 1
+        u.append("undefined_%d" % rng.randint(0, 999))
+    elif rule == "defVarExceed":
+        i = rng.randrange(len(mods))
+        d = mods[i][0]
+        d[0] += 1
+        value = mods[i][2][0] + rng.randint(0, 5)
+        if rng.random() < 0.2:
+            value = "9" * rng.randint(19, 30)  # too large for a machine integer
+        d += ["big_%d" % i, value]
+    elif rule in ["extAddExceed", "extAddEmpty"]:
+        cands = [(i, j) for i, j in _codeIndexes(mods, "E") + _codeIndexes(mods, "I")
+                 if (len(mods[i][1]) > 1) == (rule == "extAddExceed")]
+        if not cands:
+            return None
+        i, j = rng.choice(cands)
+        mods[i][2][j] = "E"
+        mods[i][2][j + 1] = rng.randint(1, 9) * 1000 + len(mods[i][1]) - 1 + rng.randint(0, 3)
+    elif rule == "absAddExceed":
+        i, j = rng.choice(_codeIndexes(mods))
+        mods[i][2][j] = "A"
+        mods[i][2][j + 1] = rng.randint(1, 9) * 1000 + rng.randint(MACHINE_MEMOERY_SIZE, 999)
+    elif rule == "relAddExceed":
+        i, j = rng.choice(_codeIndexes(mods))
+        mods[i][2][j] = "R"
+        mods[i][2][j + 1] = rng.randint(1, 9) * 1000 + mods[i][2][0] + rng.randint(0, 3)
+    elif rule == "netModExceed":
+        total = sum([m[2][0] for m in mods])
+        extra = MACHINE_MEMOERY_SIZE - total + rng.randint(1, 3)
+        mods.append(([0], [0], [extra] + ["I", 1000] * extra))
+    elif rule == "valueSyntax":
+        defs = [m[0] for m in mods if m[0][0]]
+        if not defs:
+            return None
+        rng.choice(defs)[2] = "x"
+    elif rule == "addressSyntax":
+        i = rng.randrange(len(mods))
+        mods[i][2][2] = "12a4"
+    elif rule == "addressWidth":
+        i = rng.randrange(len(mods))
+        mods[i][2][2] = rng.choice([7, 10000, 123])
+    elif rule == "startIndex":
+        m = mods[rng.randrange(len(mods))]
+        m[rng.randrange(3)][0] = "n"
+    elif rule == "structure":
+        m = mods[rng.randrange(len(mods))]
+        m[2][0] += rng.randint(1, 3)  # count exceeds the code given
+    return mods
+
+def copyModules(rng, modules, size_limit=MACHINE_MEMOERY_SIZE):
+    """
+    Insert identical copies of random modules without Def list (which would be multiply defined)
+    while the summed size stays within size_limit
+    """
+    sizes = [m[2][0] for m in modules if isinstance(m[2][0], int)]  # a count may be broken by mutate()
+    cands = [m for m in modules if m[0][0] == 0 and isinstance(m[2][0], int)]
+    total = sum(sizes)
+    for i in range(rng.randint(1, 4)):
+        if not cands:
+            break
+        m = rng.choice(cands)
+        if total + m[2][0] > size_limit:
+            break
+        modules.insert(rng.randint(modules.index(m) + 1, len(modules)), m)
+        total += m[2][0]
+
+def randomCase(rng, rule=None):
+    """
+    Return input text of a random case for rule (None for a valid input);
+    some cases repeat identical modules
+    """
+    mods = None
+    while mods is None:
+        mods = mutate(rng, randomModules(rng), rule)
+    if rng.random() < 0.3:
+        copyModules(rng, mods)
+    return formatModules(mods)
+
+def corpus(count, seed=0):
+    """
+    Generate count random cases (tuples (rule, text)) cycling through all rules
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        rule = RULES[i % len(RULES)]
+        yield rule, randomCase(rng, rule)
+
+def splitModules(text):
+    """
+    Split input text into a list of module token lists, or None if it does not parse
+    """
+    tokens = splitInput(text)
+    modules = []
+    try:
+        while tokens:
+            m = []
+            for mult in [2, 1, 2]:
+                n = int(tokens[0]) * mult + 1
+                if n > len(tokens):
+                    return None
+                m.append(tokens[:n])
+                tokens = tokens[n:]
+            modules.append(m)
+    except ValueError:
+        return None
+    return modules
+
+def shrink(engine, text, reference=referenceEngine):
+    """
+    Return a minimal input, as a subset of the modules of text, on which engine
+    still disagrees with the reference
+    """
+    modules = splitModules(text)
+    if modules is None:
+        return text
+    fails = lambda mods: engine(formatModules(mods)) != reference(formatModules(mods))
+    n = 2  # number of chunks the modules are split into (delta debugging)
+    while len(modules) > 1:
+        size = -(-len(modules) // n)  # ceiling division
+        chunks = [range(i, min(i + size, len(modules))) for i in range(0, len(modules), size)]
+        for c in chunks:
+            cand = [m for i, m in enumerate(modules) if i not in c]
+            if cand and fails(cand):
+                modules = cand
+                n = max(n - 1, 2)
+                break
+        else:
+            if n >= len(modules):
+                break
+            n = min(n * 2, len(modules))
+    return formatModules(modules)
+
+def stress(engine, count, seed=0, reference=referenceEngine, verbose=False):
+    """
+    Run engine against the reference on count random cases and return
+    a list of failing cases as tuples (rule, shrunk input, reference outcome, engine outcome)
+    """
+    failures = []
+    for n, (rule, text) in enumerate(corpus(count, seed)):
+        expected = reference(text)
+        actual = engine(text)
+        if actual != expected:
+            small = shrink(engine, text, reference)
+            failures.append((rule, small, reference(small), engine(small)))
+            if verbose:
+                utilities.output.debug("Case %d (rule %s) differs from the reference" % (n, rule))
+    return failures
+
+def coverage(count, seed=0, reference=referenceEngine):
+    """
+    Return a dictionary mapping each rule to a Counter of the reference outcome kinds on the corpus
+    """
+    r = collections.OrderedDict([(rule, collections.Counter()) for rule in RULES])
+    for rule, text in corpus(count, seed):
+        r[rule][reference(text)[0]] += 1
+    return r
+
+if __name__ == '__main__':
+    utilities.output.warning("Please run stress.py script from project's directory.")
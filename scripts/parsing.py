@@ -0,0 +1,233 @@
+# -*- coding: utf-8  -*-
+import hashlib
+import itertools
+import utilities
+from linker import Module, LinkError
+
+def splitInput(text, verbose=False):
+    """
+    Split input text into a list of tokens
+    """
+    if verbose:
+        utilities.output.debug("Reading input file...")
+    s = text.split()
+    return s
+
+def parseList(raw_list, verbose=False, start=1, base=0):
+    """
+    Parse raw_list into a list of module objects
+
+    @param start: number of the first module in raw_list
+    @param base: base address of the first module in raw_list
+    """
+    count = 0
+    modules = []
+    mod = None  # declare a local variable for module objects
+    try:
+        if verbose:
+            utilities.output.debug("Parsing module structure of input file...")        
+        while raw_list:
+            ind = count % 3
+            num = count / 3 + start
+            if ind == 0:
+                mod = Module(num, base)   # instantiate a module object at the first stage
+                mod.def_list = _parseDeflist(raw_list, num)
+            if ind == 1:
+                mod.use_list = _parseUselist(raw_list, num)
+            if ind == 2:
+                mod.code = _parseCode(raw_list, num)
+                modules.append(mod)        # append module into modules list at the last parse stage
+                base = mod.next_address    # next base address
+            count += 1
+    except LinkError:
+        raise
+    except Exception:
+        # all other exceptions should be owing to syntax errors
+        raise LinkError("There seems to be syntax errors in the input file. Please check the module structures.")
+
+    if verbose:
+        utilities.output.debug("%d modules detected in the input file..." % len(modules))
+    return modules
+
+def parseTokens(tokens, verbose=False, start=1, base=0, code=True):
+    """
+    Parse an iterable of tokens into a list of module objects, consuming
+    the tokens section by section (e.g. as generated from a stream)
+
+    @param start: number of the first module in tokens
+    @param base: base address of the first module in tokens
+    @param code: if False, keep only the size of each Code section and skip its elements
+    """
+    tokens = iter(tokens)
+    modules = []
+    bodies = {}  # dictionary mapping content hashes of module bodies to the first module with the body
+    num = start
+    try:
+        if verbose:
+            utilities.output.debug("Parsing module structure of input file...")
+        while True:
+            mod = Module(num, base)   # instantiate a module object at the first stage
+            first = next(tokens, None)
+            if first is None:
+                break
+            mod.def_list = _takeSection(first, tokens, 2, "Def list in Module %d" % num)
+            first = next(tokens, None)
+            if first is None:
+                break
+            mod.use_list = _takeSection(first, tokens, 1, "Use list in Module %d" % num)
+            first = next(tokens, None)
+            if first is None:
+                break
+            mod.code = _takeSection(first, tokens, 2, "Code in Module %d" % num, code)
+            if code:
+                _shareBody(mod, bodies)
+            modules.append(mod)        # append module into modules list at the last parse stage
+            base = mod.next_address    # next base address
+            num += 1
+    except LinkError:
+        raise
+    except Exception:
+        # all other exceptions should be owing to syntax errors
+        raise LinkError("There seems to be syntax errors in the input file. Please check the module structures.")
+
+    if verbose:
+        utilities.output.debug("%d modules detected in the input file..." % len(modules))
+    return modules
+
+def _takeSection(first, tokens, mult, msg, keep=True):
+    """
+    Return a section (Def list, Use list or Code) starting with the count first,
+    followed by count * mult elements taken from tokens (skipped if keep is False)
+    """
+    _checkFirstIndex([first], msg)
+    num = int(first) * mult
+    if keep:
+        section = [first] + list(itertools.islice(tokens, num))
+        taken = len(section) - 1
+    else:
+        section = [first]
+        taken = sum(1 for t in itertools.islice(tokens, num))
+    if taken != num:
+        raise ValueError("Section ends before %d elements" % num)
+    return section
+
+def _shareBody(mod, bodies):
+    """
+    Make mod a copy of the first module parsed with an identical body, found by content hash, if any
+    """
+    key = hashlib.sha1(" ".join(mod.def_list + mod.use_list + mod.code)).digest()  # the counts delimit sections
+    first = bodies.get(key)
+    if first is None:
+        bodies[key] = mod
+    elif (first.def_list, first.use_list, first.code) == (mod.def_list, mod.use_list, mod.code):
+        mod.shareBody(first)
+
+def resolveArchives(modules, archives, verbose=False):
+    """
+    Append to modules the archive members needed to define their undefined symbols,
+    repeating until no member defines a symbol still undefined
+
+    Symbols are visited once in order of first use; the defined symbols and the
+    symbols used are only extended by the modules of every extracted member
+
+    @param modules: a list of Module objects parsed from the input file
+    @param archives: a list of Archive objects, searched in the given order
+    """
+    extracted = set()  # set of tuples (archive position, member number) already extracted
+    defined = set()    # set of symbols defined by modules
+    used = []          # list of symbols used by modules, in order of first use
+    seen = set()       # set of symbols in used
+    _addSymbols(modules, defined, used, seen)
+    pos = 0
+    while pos < len(used):
+        var = used[pos]
+        pos += 1
+        if var in defined:
+            continue
+        for i, ar in enumerate(archives):
+            member = ar.lookup(var)
+            if member is None:
+                continue
+            if (i, member) not in extracted:
+                if verbose:
+                    utilities.output.debug("Extracting member %d of archive \"%s\" for symbol %s..." % (member, ar.path, var))
+                last = modules[-1] if modules else None
+                start = last.number + 1 if last else 1
+                base = last.next_address if last else 0
+                new = parseList(splitInput(ar.member(member)), False, start, base)
+                modules += new
+                extracted.add((i, member))
+                _addSymbols(new, defined, used, seen)
+            break  # only the first archive defining var is searched
+    # remaining undefined symbols are reported by LinkerErrors
+    return modules
+
+def _addSymbols(modules, defined, used, seen):
+    """
+    Add the symbols defined by modules to defined, and the symbols
+    used by modules and not yet seen to used
+    """
+    for mod in modules:
+        defined.update(mod.getDefVars().keys())
+        for var in mod.getUseVars():
+            if var not in seen:
+                seen.add(var)
+                used.append(var)
+
+def _parseDeflist(raw_list, mod_num):
+    """
+    Parse and return a raw sublist for Def list
+    """
+    msg = "Def list in Module %d" % mod_num
+    _checkFirstIndex(raw_list, msg)
+    f_num = int(raw_list[0])
+    num = f_num*2 + 1
+    def_list = raw_list[:num]
+    _delRange(num, raw_list)
+    return def_list
+
+def _parseUselist(raw_list, mod_num):
+    """
+    Parse and return a raw sublist for Use list
+    """
+    msg = "Use list in Module %d" % mod_num
+    _checkFirstIndex(raw_list, msg)
+    f_num = int(raw_list[0])
+    num = f_num + 1
+    use_list = raw_list[:num]
+    _delRange(num, raw_list)
+    return use_list
+    
+def _parseCode(raw_list, mod_num):
+    """
+    Parse and return a raw sublist for Code
+    """
+    msg = "Code in Module %d" % mod_num
+    _checkFirstIndex(raw_list, msg)
+    f_num = int(raw_list[0])
+    num = f_num*2 + 1
+    code = raw_list[:num]
+    _delRange(num, raw_list)
+    return code
+
+def _checkFirstIndex(l, msg):
+    """
+    Check whether the first element in the given list is an integer
+    """
+    first = 1
+    try:
+        first = int(l[0])
+        return True
+    except (IndexError, ValueError):
+        raise LinkError("Invalid starting index for %s. Must be an integer." % msg)
+    
+def _delRange(num, raw_list):
+    """
+    Delete the first "num" elements in the raw_list
+    """
+    for i in range(num):
+        del raw_list[0]  # remove saved elements from the beginning of raw_list    
+    return
+
+if __name__ == '__main__':
+    utilities.output.warning("Please run main.py script from project's directory.")
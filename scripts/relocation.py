@@ -0,0 +1,97 @@
+# -*- coding: utf-8  -*-
+import collections
+import utilities
+from linker import LinkError, MACHINE_MEMOERY_SIZE, formatOutput
+from delta import parseOutput
+
+# constants
+RELOCATIONS_HEADER = "relocations"
+
+"""
+Relocatable output layout: the linked output with a relocation section
+between the addresses and the warnings
+    <variable>=<value>
+    ...
+
+    <index>: <address>
+    ...
+
+    relocations <number of records>
+    <index> <R or E>                  (index of a word changed when the image is moved)
+    ...
+
+    Warning: ...
+"""
+
+def relocationRecords(modules, symbol_table):
+    """
+    Return a list of tuples (index, code) of the words to be changed when the linked image is moved:
+    R words, and E words resolved to a variable of symbol_table (not to a prelinked export)
+
+    @param modules: a list of Module objects with their base addresses, as linked
+    """
+    records = []
+    for mod in modules:
+        use_vars = mod.getUseVars()
+        for i, t in enumerate(mod.getCodeMap(), mod.base_address):
+            if t[0] == "R" or (t[0] == "E" and use_vars[int(t[1][1:])] in symbol_table):
+                records.append((i, t[0]))
+    return records
+
+def formatRelocations(records):
+    """
+    Return formatted relocation section of a list of relocation records
+    """
+    return "\n".join(["%s %d" % (RELOCATIONS_HEADER, len(records))] + ["%d %s" % t for t in records]) + "\n"
+
+def parseRelocatable(text):
+    """
+    Parse a relocatable output into a tuple of
+    (symbol table, list of addresses, index of the first address, relocation records, warnings text)
+    """
+    symbol_table, addrs, rest, start = parseOutput(text)
+    lines = rest.splitlines()
+    try:
+        header, n = lines[0].split()
+        n = int(n)
+        if header != RELOCATIONS_HEADER or n > len(lines) - 1:
+            raise ValueError
+        records = []
+        for l in lines[1:n + 1]:
+            ind, code = l.split()
+            if code not in ["R", "E"] or not start <= int(ind) < start + len(addrs):
+                raise ValueError
+            records.append((int(ind), code))
+    except (ValueError, IndexError):
+        raise LinkError("The input is not a relocatable output; link it with --relocatable first.")
+    warnings = "\n".join(lines[n + 1:])
+    if warnings:
+        warnings += "\n"
+    return symbol_table, addrs, start, records, warnings
+
+def rebase(text, new_base, verbose=False):
+    """
+    Return the relocatable output text moved to base address new_base,
+    changing only the words of its relocation records
+    """
+    symbol_table, addrs, start, records, warnings = parseRelocatable(text)
+    if new_base < 0 or new_base + len(addrs) > MACHINE_MEMOERY_SIZE:
+        raise LinkError("The image of %d addresses at base address %d exceeds the size of machine" % (len(addrs), new_base))
+    offset = new_base - start
+    if verbose:
+        utilities.output.debug("Moving %d addresses by %d, changing %d words..." % (len(addrs), offset, len(records)))
+
+    addrs = list(addrs)
+    for ind, code in records:
+        word = addrs[ind - start]
+        value = int(word[1:]) + offset  # rightmost 3-digit of the R or E address
+        if value < 0 or value >= MACHINE_MEMOERY_SIZE:
+            # the machine-size check of LinkedModule.__relocate; a negative offset may also go below 0
+            raise LinkError("%s address %s at %d moved by %d is outside the machine" % (code, word, ind, offset))
+        addrs[ind - start] = word[0] + str(value).zfill(3)
+    symbol_table = collections.OrderedDict([(var, str(int(value) + offset)) for var, value in symbol_table.items()])
+    records = [(ind + offset, code) for ind, code in records]
+    return formatOutput(symbol_table, addrs, new_base) + "\n" + formatRelocations(records) + "\n\n" + warnings
+
+if __name__ == '__main__':
+    utilities.output.warning("Please run main.py script from project's directory.")
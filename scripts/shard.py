@@ -0,0 +1,380 @@
+# -*- coding: utf-8  -*-
+import os
+import socket
+import threading
+import collections
+import multiprocessing
+from multiprocessing import connection
+import utilities
+from linker import Module, LinkedModule, LinkerErrors, LinkerWarnings, LinkError, \
+                   MACHINE_MEMOERY_SIZE, syntaxCheck, formatOutput
+
+"""
+Sharded link
+    * map:    every worker validates a contiguous shard of modules and returns
+              its local def table (relative to the shard), use lists and total size
+    * reduce: the coordinator computes shard base addresses by prefix sum, merges
+              the symbol tables and checks errors across shards
+    * emit:   every worker relocates and resolves its shard at its base address
+              and returns its addresses, concatenated in shard order
+
+Errors are reported as the single-process linker reports them: the first
+error of the first rule broken, in module order.
+"""
+
+# LinkerErrors rules checked locally in every shard, in the order of LinkerErrors.process()
+LOCAL_RULES = ["_defVarExceed", "_extAddExceed", "_absAddExceed", "_relAddExceed"]
+
+def _buildModules(task):
+    """
+    Return a list of Module objects of a shard task, based from 0 at the shard start
+    """
+    number, sections = task[0], task[1]
+    modules = []
+    base = 0
+    for def_list, use_list, code in sections:
+        mod = Module(number, base)
+        mod.def_list, mod.use_list, mod.code = def_list, use_list, code
+        modules.append(mod)
+        base = mod.next_address
+        number += 1
+    return modules
+
+def mapShard(task):
+    """
+    Validate a shard and return a dictionary of its local results
+
+    @param task: a tuple (number of the first module, list of (def list, use list, code) token lists,
+                 whether to check the use list warnings)
+    """
+    modules = _buildModules(task)
+    r = {"size": sum([mod.size for mod in modules]), "syntax": None, "rules": {}, "use_warnings": []}  # as (variable, module_number)
+    try:
+        syntaxCheck(modules)
+    except LinkError as e:
+        r["syntax"] = str(e)
+        return r
+
+    r["defs"] = [[(var, int(value) + mod.base_address) for var, value in mod.getDefVars().items()] for mod in modules]
+    r["uses"] = [mod.getUseVars() for mod in modules]
+    errors = LinkerErrors(modules)
+    for rule in LOCAL_RULES:
+        try:
+            getattr(errors, rule)()
+        except LinkError as e:
+            r["rules"][rule] = str(e)
+    if not r["rules"] and task[2]:
+        warnings = LinkerWarnings(modules, [], [])
+        warnings._useVarUnuse()  # the use list warnings are local to a module
+        r["use_warnings"] = warnings.use_warnings
+    return r
+
+def emitShard(task):
+    """
+    Relocate and resolve a shard at its base address and return a tuple (error or None, addresses)
+
+    @param task: a tuple (number of the first module, sections, base address, dictionary of used symbol values)
+    """
+    modules = _buildModules(task)
+    base, values = task[2], task[3]
+    addrs = []
+    try:
+        for mod in modules:
+            use_vals = collections.OrderedDict()
+            for var in mod.getUseVars():
+                use_vals.update([(var, values[var])])
+            lmod = LinkedModule(mod.number, mod.base_address + base, mod.getDefVars(), mod.getUseVars(), mod.getCodeMap(), use_vals)
+            lmod.process()
+            addrs += [t[1] for t in lmod.code_map]
+    except LinkError as e:
+        return str(e), []
+    return None, addrs
+
+# dictionary mapping names of worker functions to functions, as sent over transports
+WORKER_FUNCTIONS = {"map": mapShard, "emit": emitShard}
+
+def _dispatch(call):
+    return WORKER_FUNCTIONS[call[0]](call[1])
+
+class SerialTransport(object):
+    """
+    SerialTransport: runs shard tasks one after another in this process
+    """
+    def map(self, name, tasks):
+        return [WORKER_FUNCTIONS[name](t) for t in tasks]
+
+    def close(self):
+        pass
+
+class LocalTransport(object):
+    """
+    LocalTransport: runs shard tasks in a pool of local worker processes
+    """
+    def __init__(self, processes=None):
+        self.__pool = multiprocessing.Pool(processes)
+
+    def map(self, name, tasks):
+        return self.__pool.map(_dispatch, [(name, t) for t in tasks])
+
+    def close(self):
+        self.__pool.close()
+        self.__pool.join()
+
+def serve(address, authkey, ready=None):
+    """
+    Serve shard tasks on address until a shutdown request (None) is received;
+    used as a worker node by SocketTransport
+
+    Every result is sent as a tuple (error message or None, result), so that
+    an exception of a task is reported by the coordinator
+
+    @param address: a tuple (host, port); port 0 for any free port
+    @param ready: a queue to put the actual address on once listening
+    """
+    listener = connection.Listener(address, authkey=authkey)
+    if ready is not None:
+        ready.put(listener.address)
+    try:
+        while True:
+            try:
+                conn = listener.accept()
+            except connection.AuthenticationError:
+                continue  # a client with another authkey
+            try:
+                while True:
+                    try:
+                        call = conn.recv()
+                    except EOFError:
+                        break
+                    if call is None:
+                        return
+                    try:
+                        conn.send((None, _dispatch(call)))
+                    except Exception as e:
+                        conn.send(("%s: %s" % (type(e).__name__, e), None))
+            finally:
+                conn.close()
+    finally:
+        listener.close()
+
+def parseAddress(s):
+    """
+    Convert a worker node address such as "node1:6000" into a tuple (host, port)
+    """
+    host, sep, port = s.strip().rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError("Invalid worker address \"%s\". Must be HOST:PORT." % s)
+    return host, int(port)
+
+class SocketTransport(object):
+    """
+    SocketTransport: runs shard tasks on worker nodes over sockets
+        * Connects to worker nodes running serve() at the given addresses, or
+        * Starts local worker processes as a stand-in for worker nodes
+    """
+    def __init__(self, addresses=None, processes=2, authkey=None):
+        """
+        @param addresses: a list of (host, port) of running worker nodes; None to start local ones
+        @param processes: number of local worker processes started if addresses is None
+        @param authkey: shared secret of the worker nodes
+        """
+        self.__authkey = authkey or os.urandom(16)
+        self.__processes = []
+        if addresses is None:
+            ready = multiprocessing.Queue()
+            for i in range(processes):
+                p = multiprocessing.Process(target=serve, args=(("localhost", 0), self.__authkey, ready))
+                p.daemon = True
+                p.start()
+                self.__processes.append(p)
+            addresses = [ready.get() for p in self.__processes]
+        self.__addresses = addresses
+        self.__conns = []
+        for a in addresses:
+            try:
+                self.__conns.append(connection.Client(a, authkey=self.__authkey))
+            except (socket.error, EOFError, connection.AuthenticationError) as e:
+                for p in self.__processes:
+                    p.terminate()
+                self.__processes = []
+                self.close()
+                raise LinkError("Cannot connect to the shard worker at %s:%d: %s" % (a[0], a[1], e))
+
+    def map(self, name, tasks):
+        results = [None] * len(tasks)
+        errors = [None] * len(tasks)  # error message of every task that failed
+        def work(k, indexes):
+            conn = self.__conns[k]
+            for i in indexes:
+                try:
+                    conn.send((name, tasks[i]))
+                    errors[i], results[i] = conn.recv()
+                except (socket.error, EOFError, IOError) as e:
+                    errors[i] = "connection lost (%s)" % (str(e) or type(e).__name__)
+                if errors[i] is not None:
+                    errors[i] = "The shard worker at %s:%d failed: %s" % (self.__addresses[k][0], self.__addresses[k][1], errors[i])
+                    return
+        n = len(self.__conns)
+        threads = [threading.Thread(target=work, args=(k, range(k, len(tasks), n))) for k in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for e in errors:
+            if e is not None:
+                raise LinkError(e)
+        if None in results:
+            raise LinkError("A shard worker failed to return its result.")
+        return results
+
+    def close(self):
+        for conn in self.__conns:
+            if self.__processes:
+                try:
+                    conn.send(None)  # shut down the local stand-in workers
+                except (socket.error, IOError):
+                    pass
+            conn.close()
+        self.__conns = []
+        for p in self.__processes:
+            p.join()
+
+# dictionary mapping transport names to transport classes
+TRANSPORTS = {"serial": SerialTransport, "local": LocalTransport, "socket": SocketTransport}
+
+class ShardResult(object):
+    """
+    ShardResult: result of a sharded link, with the output interface of a processed Modules object
+    """
+    def __init__(self, symbol_table, image, def_warnings, use_warnings, number):
+        """
+        @param def_warnings: a list of tuples (variable, module_number) defined but never used
+        @param use_warnings: a list of tuples (variable, module_number) in a use list but not used
+        """
+        self.__symbol_table = symbol_table
+        self.__image = image
+        self.__def_warnings = def_warnings
+        self.__use_warnings = use_warnings
+        self.__number = number
+
+    @property
+    def symbol_table(self):
+        return self.__symbol_table
+
+    @property
+    def number(self):
+        return self.__number
+
+    @property
+    def start_address(self):
+        return 0
+
+    @property
+    def def_warnings(self):
+        return self.__def_warnings
+
+    @property
+    def use_warnings(self):
+        return self.__use_warnings
+
+    @property
+    def linker_warnings(self):
+        return self  # def_warnings and use_warnings, as of LinkerWarnings
+
+    @property
+    def warnings(self):
+        return ["%s was defined in Module %d but was never used" % t for t in self.__def_warnings] + \
+               ["%s appeared in the use list in Module %d but not used" % t for t in self.__use_warnings]
+
+    def image(self):
+        return self.__image
+
+    def output(self):
+        return formatOutput(self.__symbol_table, self.__image)
+
+    def outputWarnings(self):
+        """
+        Return formatted output of all warnings, as LinkerWarnings.output()
+        """
+        return "".join(["Warning: %s.\n" % w for w in self.warnings])
+
+def _splitShards(modules, shards):
+    """
+    Split a list of Module objects into at most shards tasks of contiguous modules
+    """
+    size = max(1, -(-len(modules) // max(1, shards)))  # ceiling division
+    tasks = []
+    for i in range(0, len(modules), size):
+        part = modules[i:i + size]
+        tasks.append((part[0].number, [(m.def_list, m.use_list, m.code) for m in part]))
+    return tasks
+
+def link(modules, transport, shards, check_warnings=True, verbose=False):
+    """
+    Link a list of Module objects (as parsed) shard by shard over transport and return a ShardResult
+
+    @param transport: a transport object, e.g. LocalTransport()
+    @param shards: number of shards
+    """
+    tasks = _splitShards(modules, shards)
+    if verbose:
+        utilities.output.debug("Validating %d modules in %d shards..." % (len(modules), len(tasks)))
+    results = transport.map("map", [t + (check_warnings,) for t in tasks])
+
+    # errors in the order of Modules: syntax, then LinkerErrors rules
+    for r in results:
+        if r["syntax"]:
+            raise LinkError(r["syntax"])
+
+    all_def_vars = [var for r in results for defs in r["defs"] for var, value in defs]
+    dp = utilities.getduplicate(all_def_vars)
+    if dp:
+        raise LinkError("%s multiply defined" % dp[0])
+    all_use_vars = list(set([var for r in results for uses in r["uses"] for var in uses]))
+    def_set = set(all_def_vars)
+    for v in all_use_vars:
+        if v not in def_set:
+            raise LinkError("%s used but not defined" % v)
+    for rule in LOCAL_RULES:
+        for r in results:
+            if rule in r["rules"]:
+                raise LinkError(r["rules"][rule])
+    sum_size = sum([r["size"] for r in results])
+    if sum_size > MACHINE_MEMOERY_SIZE:
+        raise LinkError("The summed size of all modules, which is %d, exceeds the size of machine" % sum_size)
+
+    # shard base addresses by prefix sum, and merged symbol table
+    bases = []
+    base = 0
+    for r in results:
+        bases.append(base)
+        base += r["size"]
+    symbol_table = collections.OrderedDict()
+    for r, shard_base in zip(results, bases):
+        for defs in r["defs"]:
+            for var, value in defs:
+                symbol_table.update([(var, str(value + shard_base))])
+
+    def_warnings = []
+    use_set = set(all_use_vars)
+    if check_warnings and def_set != use_set:
+        for r, task in zip(results, tasks):
+            for k, defs in enumerate(r["defs"]):
+                def_warnings += [(var, task[0] + k) for var, value in defs if var not in use_set]
+    use_warnings = [w for r in results for w in r["use_warnings"]]
+
+    if verbose:
+        utilities.output.debug("Relocating and resolving %d shards..." % len(tasks))
+    emit_tasks = []
+    for task, r, shard_base in zip(tasks, results, bases):
+        used = set([var for uses in r["uses"] for var in uses])
+        emit_tasks.append(task + (shard_base, dict([(var, symbol_table[var]) for var in used])))
+    image = []
+    for error, addrs in transport.map("emit", emit_tasks):
+        if error:
+            raise LinkError(error)
+        image += addrs
+    return ShardResult(symbol_table, image, def_warnings, use_warnings, len(modules))
+
+if __name__ == '__main__':
+    utilities.output.warning("Please run main.py script from project's directory.")
@@ -0,0 +1,181 @@
+# -*- coding: utf-8  -*-
+import os
+import bz2
+import zlib
+import gzip
+import utilities
+from linker import LinkError
+try:
+    import lzma
+except ImportError:
+    lzma = None        # Python 2 has no lzma module; xz is supported if a backport is installed
+try:
+    import zstandard
+except ImportError:
+    zstandard = None   # optional; zstd is supported if the zstandard package is installed
+
+# constants
+CHUNK_SIZE = 64 * 1024
+MAGIC_NUMBERS = [("\x1f\x8b", "gzip"),
+                 ("BZh", "bz2"),
+                 ("\xfd7zXZ\x00", "xz"),
+                 ("\x28\xb5\x2f\xfd", "zstd"),
+                 ("\x78\x01", "zlib"), ("\x78\x5e", "zlib"), ("\x78\x9c", "zlib"), ("\x78\xda", "zlib")]
+EXTENSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz", ".zst": "zstd"}
+
+def _decompressor(codec):
+    """
+    Return a new decompressor object (with decompress() and unused_data) for codec
+    """
+    if codec == "gzip":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if codec == "zlib":
+        return zlib.decompressobj()
+    if codec == "bz2":
+        return bz2.BZ2Decompressor()
+    if codec == "xz":
+        if lzma is None:
+            raise LinkError("xz-compressed input requires the lzma module (Python 3.3+ or backports.lzma).")
+        return lzma.LZMADecompressor()
+    if codec == "zstd":
+        if zstandard is None:
+            raise LinkError("zstd-compressed input requires the zstandard package.")
+        return zstandard.ZstdDecompressor().decompressobj()
+
+class DecompressingReader(object):
+    """
+    DecompressingReader: file-like object decompressing a compressed stream chunk by chunk
+        * Concatenated members (e.g. of gzip or bz2) are decompressed in sequence
+    """
+    def __init__(self, f, codec, data=""):
+        """
+        @param f: file object of the compressed stream
+        @param codec: name of the compression format, as in MAGIC_NUMBERS
+        @param data: compressed bytes already read from f
+        """
+        self.__f = f
+        self.__codec = codec
+        self.__pending = data  # compressed bytes not yet fed to the decompressor
+        self.__decompressor = _decompressor(codec)
+
+    def read(self, size=CHUNK_SIZE):
+        """
+        Return up to about size decompressed bytes; an empty string at the end of the stream
+        """
+        while True:
+            data = self.__pending or self.__f.read(size)
+            self.__pending = ""
+            if not data:
+                return ""
+            try:
+                out = self.__decompressor.decompress(data)
+            except EOFError:
+                # the previous member ended exactly at the end of a chunk
+                self.__decompressor = _decompressor(self.__codec)
+                out = self.__decompressor.decompress(data)
+            unused = getattr(self.__decompressor, "unused_data", "")
+            if unused:
+                self.__pending = unused
+                self.__decompressor = _decompressor(self.__codec)  # next member
+            if out:
+                return out
+
+    def close(self):
+        self.__f.close()
+
+class PrefixedReader(object):
+    """
+    PrefixedReader: file-like object returning bytes already read before the rest of a file
+    """
+    def __init__(self, f, data):
+        self.__f = f
+        self.__data = data
+
+    def read(self, size=CHUNK_SIZE):
+        if self.__data:
+            data, self.__data = self.__data, ""
+            return data
+        return self.__f.read(size)
+
+    def close(self):
+        self.__f.close()
+
+def detectCodec(data):
+    """
+    Return the name of the compression format of data by its magic number, or None
+    """
+    for magic, codec in MAGIC_NUMBERS:
+        if data.startswith(magic):
+            return codec
+    return None
+
+def openStream(f):
+    """
+    Return a file-like object reading the (decompressed if needed) content of f
+    """
+    data = f.read(6)
+    codec = detectCodec(data)
+    if codec:
+        return DecompressingReader(f, codec, data)
+    return PrefixedReader(f, data)
+
+def openInput(path):
+    """
+    Open /path/to/input-file, decompressing it on the fly if it is compressed
+    """
+    try:
+        return openStream(open(path, "rb"))
+    except IOError:
+        raise LinkError("Cannot open the file \"%s\"" % path)
+
+def iterTokens(f, chunk_size=CHUNK_SIZE):
+    """
+    Generate the whitespace-separated tokens of file object f, reading chunk by chunk
+    """
+    rest = ""  # partial token at the end of the previous chunk
+    while True:
+        data = f.read(chunk_size)
+        if not data:
+            break
+        data = rest + data
+        tokens = data.split()
+        rest = ""
+        if tokens and not data[-1].isspace():
+            rest = tokens.pop()
+        for t in tokens:
+            yield t
+    if rest:
+        yield rest
+
+def iterFileTokens(path, chunk_size=CHUNK_SIZE):
+    """
+    Generate the tokens of /path/to/input-file, decompressing it on the fly if it is compressed
+    """
+    f = openInput(path)
+    try:
+        for t in iterTokens(f, chunk_size):
+            yield t
+    finally:
+        f.close()
+
+def openOutput(path, mode="w"):
+    """
+    Open /path/to/output-file for writing, compressed by the format of its extension if any
+    """
+    codec = EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if codec == "gzip":
+        return gzip.open(path, "wb")
+    if codec == "bz2":
+        return bz2.BZ2File(path, "w")
+    if codec == "xz":
+        if lzma is None:
+            raise LinkError("xz-compressed output requires the lzma module (Python 3.3+ or backports.lzma).")
+        return lzma.open(path, "wb")
+    if codec == "zstd":
+        if zstandard is None:
+            raise LinkError("zstd-compressed output requires the zstandard package.")
+        return zstandard.ZstdCompressor().stream_writer(open(path, "wb"))
+    return open(path, mode)
+
+if __name__ == '__main__':
+    utilities.output.warning("Please run main.py script from project's directory.")
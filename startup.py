@@ -0,0 +1,80 @@
+#! /usr/bin/env python
+# -*- coding: utf-8  -*-
+import os
+import sys
+import time
+import tempfile
+import subprocess
+from scripts import utilities
+utilities.check_version()
+import argparse
+
+# a trivial input linking a single module
+TRIVIAL_INPUT = "1 x 0\n0\n1 R 1000\n"
+
+def getArgs():
+    """Parse command-line arguments of the startup benchmark"""
+
+    parser = argparse.ArgumentParser(
+                                     formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     description="Measure time to first output of the linker on a trivial input",
+                                     usage="[python] [./]%(prog)s [-n RUNS] [--limit MS] [bundle ...]",
+                                     epilog="usage examples: \n\
+  %(prog)s                      (time main.py, plain and with an option parsed by argparse)\n\
+  %(prog)s module-linker.pyz    (also time a bundle made by bundle.sh)\n\
+  %(prog)s -n 50 --limit 60     (exit status 1 if a median exceeds 60 ms)\n"
+                                     )
+    parser.add_argument('bundles', nargs='*', metavar="bundle", help="/path/to/bundle made by bundle.sh to time as well")
+    parser.add_argument('-n','--runs', type=int, default=20, help="number of runs of every command (default: 20)")
+    parser.add_argument('--limit', type=float, metavar="MS", help="fail if the median time of a command exceeds MS milliseconds")
+    return parser.parse_args()
+
+def firstOutput(command):
+    """
+    Run command and return the seconds until its first byte of standard output
+    """
+    start = time.time()
+    proc = subprocess.Popen(command, stdout=subprocess.PIPE)
+    proc.stdout.read(1)
+    elapsed = time.time() - start
+    proc.stdout.read()
+    if proc.wait() != 0:
+        raise RuntimeError("\"%s\" exited with status %d" % (" ".join(command), proc.returncode))
+    return elapsed
+
+def measure(command, runs):
+    """
+    Return a sorted list of the times to first output (in milliseconds) of runs runs of command
+    """
+    firstOutput(command)  # warm up the file system cache
+    return sorted([firstOutput(command) * 1000 for i in range(runs)])
+
+def main():
+    """
+    Time every command and report median, minimum and maximum
+    """
+    args = getArgs()
+    fd, input_file = tempfile.mkstemp(suffix=".txt")
+    os.write(fd, TRIVIAL_INPUT)
+    os.close(fd)
+    main_py = os.path.join(os.path.dirname(os.path.abspath(sys.argv[0])), "main.py")
+    commands = [("main.py", [sys.executable, main_py, input_file]),
+                ("main.py -p", [sys.executable, main_py, "-p", input_file])]
+    commands += [(b, [sys.executable, b, input_file]) for b in args.bundles]
+
+    failed = False
+    try:
+        for name, command in commands:
+            times = measure(command, args.runs)
+            median = times[len(times) // 2]
+            print "%-20s median %6.1f ms  min %6.1f ms  max %6.1f ms  (%d runs)" % (name, median, times[0], times[-1], len(times))
+            if args.limit is not None and median > args.limit:
+                failed = True
+    finally:
+        os.remove(input_file)
+    if failed:
+        utilities.output.error("Median time to first output exceeds %.1f ms." % args.limit)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#! /usr/bin/env python
+# -*- coding: utf-8  -*-
+import sys
+from scripts import utilities
+utilities.check_version()
+import argparse
+from scripts import oracle
+
+def getArgs():
+    """Parse command-line arguments of the differential stress test"""
+
+    parser = argparse.ArgumentParser(
+                                     formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     description="Check linker engines against the reference linker on random inputs",
+                                     usage="[python] [./]%(prog)s [-v] [-c COUNT] [-s SEED] [engine ...]",
+                                     epilog="engines: %s\n\n\
+usage examples: \n\
+  %%(prog)s                     (check all engines on 1000 random inputs)\n\
+  %%(prog)s -c 100000 api       (check the api engine on 100000 random inputs)\n\
+  %%(prog)s --coverage          (show reference outcomes per rule)\n" % ", ".join(sorted(oracle.ENGINES.keys()))
+                                     )
+    parser.add_argument('engines', nargs='*', metavar="engine", help="name of an engine to check; all engines if not given")
+    parser.add_argument('-c','--count', type=int, default=1000, help="number of random inputs (default: 1000)")
+    parser.add_argument('-s','--seed', type=int, default=0, help="seed of the random inputs (default: 0)")
+    parser.add_argument('-v','--verbose', action="store_true", dest="to_verbose", help="print verbose information")
+    parser.add_argument('--coverage', action="store_true", dest="coverage", help="print reference outcomes per rule instead of checking engines")
+    args = parser.parse_args()
+
+    for e in args.engines:
+        if e not in oracle.ENGINES:
+            utilities.output.error("Unknown engine \"%s\"." % e)
+            sys.exit(1)
+    return args
+
+def main():
+    """
+    Run the stress test and report shrunk failing cases
+    """
+    args = getArgs()
+    if args.coverage:
+        for rule, counter in oracle.coverage(args.count, args.seed).items():
+            print "%-14s %s" % (rule, " ".join(["%s=%d" % t for t in sorted(counter.items())]))
+        return
+
+    failed = False
+    for name in args.engines or sorted(oracle.ENGINES.keys()):
+        if args.to_verbose:
+            utilities.output.debug("Checking engine \"%s\" on %d random inputs..." % (name, args.count))
+        failures = oracle.stress(oracle.ENGINES[name], args.count, args.seed, verbose=args.to_verbose)
+        if not failures:
+            print "%s: %d inputs, no difference" % (name, args.count)
+            continue
+        failed = True
+        print "%s: %d inputs, %d differences" % (name, args.count, len(failures))
+        for rule, text, expected, actual in failures:
+            print "\nRule: %s\nInput:\n%sReference: %s\nEngine:    %s" % (rule, text, expected, actual)
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()